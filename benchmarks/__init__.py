@@ -0,0 +1 @@
+"""Reproducible benchmarks for the data, training, inference and chart paths"""
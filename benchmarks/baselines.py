@@ -0,0 +1,38 @@
+"""
+Earlier implementations kept as benchmark baselines
+
+These are the code paths the pipeline has since replaced, copied as they
+were so that a benchmark run can still measure the old numbers next to
+the new ones on the same machine and data.
+"""
+import pandas as pd
+
+KEYS = ['Crop', 'Season', 'Year']
+
+
+def legacy_melt_dataframe(df, value_name):
+    """Melt a wide measure file, extracting the year from every melted row with a regex"""
+    year_cols = [col for col in df.columns if col not in ['Crop', 'Season']]
+
+    melted = pd.melt(df,
+                     id_vars=['Crop', 'Season'],
+                     value_vars=year_cols,
+                     var_name='Year_Column',
+                     value_name=value_name)
+
+    # Extract year from column name (e.g., 'Yield-2015-16' -> 2015)
+    melted['Year'] = melted['Year_Column'].str.extract(r'(\d{4})-\d{2}').iloc[:, 0].astype(int)
+    melted = melted.drop('Year_Column', axis=1)
+    melted[value_name] = pd.to_numeric(melted[value_name], errors='coerce')
+
+    return melted
+
+
+def legacy_merge_measures(frames):
+    """Melt the Yield, Production and Area frames and join them with two outer merges"""
+    yield_long = legacy_melt_dataframe(frames['Yield'], 'Yield')
+    production_long = legacy_melt_dataframe(frames['Production'], 'Production')
+    area_long = legacy_melt_dataframe(frames['Area'], 'Area')
+
+    merged_df = yield_long.merge(production_long, on=KEYS, how='outer')
+    return merged_df.merge(area_long, on=KEYS, how='outer')
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Benchmark the data processing, training, inference and chart paths
+
+Each size generates synthetic raw data in a temporary workspace, so runs
+never touch the real data or models. Results are written as JSON; pass an
+earlier result file with --compare to flag regressions.
+
+    python -m benchmarks.run_benchmarks --sizes small medium --output bench.json
+    python -m benchmarks.run_benchmarks --sizes small --compare bench.json
+"""
+import argparse
+import contextlib
+import io
+import itertools
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+from benchmarks.baselines import legacy_merge_measures
+from benchmarks.synthetic import generate_raw_data, load_templates, write_raw_data
+
+# Synthetic dataset sizes; rows = crops * states * seasons, each with n_years values
+SIZES = {
+    'small': dict(n_crops=50, n_seasons=4, n_states=1, n_years=10),
+    'medium': dict(n_crops=200, n_seasons=4, n_states=5, n_years=20),
+    'large': dict(n_crops=1000, n_seasons=6, n_states=10, n_years=30)
+}
+GROUPS = ['data', 'train', 'predict', 'charts']
+
+
+def measure(func, repeat=5, warmup=1, number=1):
+    """Time func; returns per-call seconds (min/median/mean/p95/max) over repeat runs"""
+    for _ in range(warmup):
+        func()
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        times.append((time.perf_counter() - start) / number)
+    times = np.array(times)
+    return {
+        'repeat': repeat,
+        'number': number,
+        'min': float(times.min()),
+        'median': float(np.median(times)),
+        'mean': float(times.mean()),
+        'p95': float(np.percentile(times, 95)),
+        'max': float(times.max())
+    }
+
+
+def configure_workspace(root):
+    """Point every Config path at a scratch directory"""
+    Config.DATA_DIR = os.path.join(root, 'data')
+    Config.RAW_DATA_DIR = os.path.join(Config.DATA_DIR, 'raw')
+    Config.PROCESSED_DATA_DIR = os.path.join(Config.DATA_DIR, 'processed')
+    Config.MODEL_DIR = os.path.join(root, 'saved_models')
+    Config.MODEL_FILE = os.path.join(Config.MODEL_DIR, 'crop_prediction_models.pkl')
+    Config.ARTIFACT_DIR = os.path.join(Config.MODEL_DIR, 'artifacts')
+    Config.SEARCH_RESULTS_FILE = os.path.join(Config.MODEL_DIR, 'search_trials.json')
+
+
+def quiet(func):
+    """Wrap func so the pipeline's progress prints do not flood the output"""
+    def wrapper(*args, **kwargs):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return func(*args, **kwargs)
+    return wrapper
+
+
+def run_size(size, params, groups, repeat, n_jobs, templates=None):
+    """Run every selected benchmark group on one synthetic dataset size"""
+    from models.data_processor import DataProcessor
+    from models.data_store import DataStore
+    from models.model_trainer import ModelTrainer
+    from models.predictor import CropPredictor
+    from dashboard.components import charts
+
+    results = []
+
+    def record(name, func, **kwargs):
+        entry = {'name': name, 'size': size}
+        try:
+            entry['stats'] = measure(func, repeat=kwargs.pop('repeat', repeat), **kwargs)
+        except Exception as e:
+            entry['error'] = f'{type(e).__name__}: {e}'
+        results.append(entry)
+        status = entry.get('error') or f"median {entry['stats']['median'] * 1e3:.3f} ms"
+        print(f"  {name:<42} {status}", file=sys.stderr)
+
+    frames = generate_raw_data(templates=templates, **params)
+    write_raw_data(frames, Config.RAW_DATA_DIR)
+
+    processor = DataProcessor()
+    merged_df = quiet(processor.load_and_process_data)()
+    X_yield, y_yield, X_production, y_production = quiet(processor.prepare_features)(merged_df)
+
+    if 'data' in groups:
+        record('data.melt_dataframe', lambda: processor.melt_dataframe(frames['Yield'], 'Yield'))
+        # The original regex melt + two outer merges, the header-map melt + merges
+        # (the pipeline's fallback) and the single alignment the pipeline uses
+        record('data.merge_measures_legacy', lambda: legacy_merge_measures(frames))
+        record('data.merge_measures', lambda: processor.merge_measures(frames))
+        record('data.align_measures', lambda: processor.align_measures(frames))
+        record('data.load_and_process_data', quiet(DataProcessor().load_and_process_data))
+
+    trainer = ModelTrainer(processor)
+    train = quiet(lambda: trainer.train_models(X_yield, y_yield, X_production, y_production, n_jobs=n_jobs))
+    if 'train' in groups:
+        record('train.train_models', train, repeat=1, warmup=0)
+    else:
+        train()
+    quiet(trainer.save_models)()
+
+    store = DataStore()
+    predictor = quiet(CropPredictor)(data_store=store)
+    frame = store.frame
+    crops = list(frame['Crop'].cat.categories)
+    seasons = list(frame['Season'].cat.categories)
+
+    if 'predict' in groups:
+        rng = np.random.RandomState(0)
+        inputs = [(crops[rng.randint(len(crops))], seasons[rng.randint(len(seasons))],
+                   float(rng.uniform(1, 500)), int(rng.randint(2020, 2035))) for _ in range(200)]
+        cursor = itertools.cycle(inputs)
+        record('predict.single', lambda: predictor.predict(*next(cursor)), number=200)
+
+        batch = pd.DataFrame(inputs * 5, columns=['crop', 'season', 'area', 'year'])
+        record('predict.batch_1000', lambda: predictor.predict_batch(batch))
+
+    if 'charts' in groups:
+        season = 'Kharif' if 'Kharif' in seasons else seasons[0]
+        builders = {
+            'charts.create_enhanced_trend_chart': lambda: charts.create_enhanced_trend_chart(frame, crops[0], 'Yield'),
+            'charts.create_enhanced_comparison_chart': lambda: charts.create_enhanced_comparison_chart(frame, season),
+            'charts.create_productivity_radar_chart': lambda: charts.create_productivity_radar_chart(frame, crops[:5], season),
+            'charts.create_correlation_heatmap': lambda: charts.create_correlation_heatmap(frame),
+            'charts.create_empty_chart': lambda: charts.create_empty_chart()
+        }
+        for name, builder in builders.items():
+            record(name, builder)
+
+    for entry in results:
+        entry['rows'] = {'raw': len(frames['Yield']), 'processed': len(merged_df)}
+    return results
+
+
+def environment():
+    """Versions and machine details stored with every result file"""
+    import sklearn
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'commit': commit,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'sklearn': sklearn.__version__
+    }
+
+
+def compare(results, baseline, threshold):
+    """Median ratios against a baseline; returns the entries slower than 1 + threshold or now failing"""
+    previous = {(entry['name'], entry['size']): entry for entry in baseline['results'] if 'stats' in entry}
+    regressions = []
+    for entry in results:
+        before = previous.get((entry['name'], entry['size']))
+        if before is None:
+            continue
+        if 'stats' not in entry:
+            # Ran in the baseline but raises now
+            regressions.append(entry)
+            continue
+        ratio = entry['stats']['median'] / before['stats']['median']
+        entry['baseline_ratio'] = ratio
+        if ratio > 1 + threshold:
+            regressions.append(entry)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the crop prediction pipeline")
+    parser.add_argument("--sizes", nargs="+", default=['small'], choices=list(SIZES),
+                        help="synthetic dataset sizes to run")
+    parser.add_argument("--groups", nargs="+", default=GROUPS, choices=GROUPS,
+                        help="benchmark groups to run")
+    parser.add_argument("--repeat", type=int, default=5, help="timed repetitions per benchmark")
+    parser.add_argument("--jobs", type=int, default=1, help="training worker budget")
+    parser.add_argument("--output", help="write the JSON results to this file (default: stdout)")
+    parser.add_argument("--compare", help="baseline JSON file to compare medians against")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="relative slowdown that counts as a regression")
+    args = parser.parse_args()
+
+    # Read the real files' levels before Config points at the scratch workspace
+    templates = load_templates()
+    report = {'environment': environment(), 'sizes': {size: SIZES[size] for size in args.sizes}, 'results': []}
+    for size in args.sizes:
+        print(f"⏱️  {size}: {SIZES[size]}", file=sys.stderr)
+        with tempfile.TemporaryDirectory(prefix=f'crop-bench-{size}-') as root:
+            configure_workspace(root)
+            report['results'].extend(run_size(size, SIZES[size], args.groups, args.repeat, args.jobs, templates))
+
+    regressions = []
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(report['results'], json.load(f), args.threshold)
+        for entry in regressions:
+            if 'stats' not in entry:
+                print(f"❌ Regression: {entry['name']} ({entry['size']}) ran in the baseline "
+                      f"but now fails: {entry['error']}", file=sys.stderr)
+            else:
+                print(f"❌ Regression: {entry['name']} ({entry['size']}) is "
+                      f"{entry['baseline_ratio']:.2f}x the baseline median", file=sys.stderr)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + '\n')
+        print(f"✅ Results written to {args.output}", file=sys.stderr)
+    else:
+        print(output)
+
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Synthetic raw datasets in the schema of the real All-India CSVs
+
+Rows are generated in chunks, so files far larger than memory can be
+written with stream_raw_data (or from the command line):
+
+    python -m benchmarks.synthetic --output-dir /tmp/raw --crops 500 --states 30 --districts 40 --years 30
+"""
+import argparse
+import os
+import sys
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+
+MEASURES = ['Yield', 'Production', 'Area']
+BASE_SEASONS = ['Kharif', 'Rabi', 'Summer', 'Total']
+
+
+def year_column(measure, year):
+    """Raw column name of a measure for a crop year, e.g. Yield-2015-16"""
+    return f'{measure}-{year}-{(year + 1) % 100:02d}'
+
+
+def raw_path(directory, measure, config=None):
+    """Path of a measure's raw file under the file names from Config"""
+    config = config or Config()
+    return os.path.join(directory, getattr(config, f'{measure.upper()}_FILE'))
+
+
+def load_templates(config=None):
+    """Per-row (yield, area) levels of the real raw files, used to shape synthetic rows
+
+    Falls back to a fixed range of plausible levels when the raw files are
+    not available.
+    """
+    config = config or Config()
+    try:
+        frames = {
+            measure: pd.read_csv(raw_path(config.RAW_DATA_DIR, measure, config))
+            for measure in ['Yield', 'Area']
+        }
+        levels = pd.DataFrame({
+            measure: frame.drop(columns=['Crop', 'Season']).apply(pd.to_numeric, errors='coerce').mean(axis=1)
+            for measure, frame in frames.items()
+        }).dropna()
+        if not levels.empty:
+            return levels.to_numpy()
+    except (OSError, ValueError, KeyError):
+        pass
+    return np.column_stack([np.linspace(800, 3500, 12), np.linspace(5, 400, 12)])
+
+
+class SyntheticSpec:
+    """Cardinalities and effects of a synthetic dataset
+
+    There is one row per (crop, state, district, season). States and
+    districts are folded into the crop label ("Crop0007 (State03/D012)")
+    because the raw schema only has Crop and Season. A row's yield and
+    area start from a real row's level (templates) scaled by crop, state,
+    district and season effects, then follow the crop's growth trend plus
+    a row-level deviation, year-wide shocks (droughts cut yield in a few
+    years) and noise. Production is area * yield / 1000 as in the real
+    files; missing_rate of the cells are left blank.
+
+    Per-crop/state/district/year effects are drawn once from seed and row
+    noise per chunk from (seed, first row of the chunk), so the same seed
+    and chunk size reproduce a dataset exactly.
+    """
+
+    def __init__(self, n_crops=100, n_seasons=4, n_states=1, n_districts=1, n_years=10,
+                 start_year=2015, missing_rate=0.05, shock_rate=0.1, seed=0, templates=None):
+        self.n_crops = n_crops
+        self.n_seasons = n_seasons
+        self.n_states = n_states
+        self.n_districts = n_districts
+        self.n_years = n_years
+        self.start_year = start_year
+        self.missing_rate = missing_rate
+        self.seed = seed
+        self.years = np.arange(start_year, start_year + n_years)
+        self.seasons = (BASE_SEASONS + [f'Season{k:02d}' for k in range(len(BASE_SEASONS), n_seasons)])[:n_seasons]
+
+        rng = np.random.RandomState(seed)
+        templates = load_templates() if templates is None else np.asarray(templates)
+        self.crop_level = templates[rng.randint(len(templates), size=n_crops)] * rng.uniform(0.5, 1.5, size=(n_crops, 2))
+        self.crop_growth = rng.normal(0.01, 0.015, size=(n_crops, 2))
+        self.state_effect = rng.lognormal(0, 0.2, size=(n_states, 2))
+        self.district_effect = rng.lognormal(0, 0.15, size=(n_states, n_districts, 2))
+        self.season_effect = rng.uniform(0.3, 1.2, size=(n_seasons, 2))
+        # Year-wide shocks shared by every row (e.g. a poor monsoon)
+        self.year_shock = np.where(rng.rand(n_years) < shock_rate, rng.uniform(0.7, 0.9, size=n_years), 1.0)
+
+    @property
+    def n_rows(self):
+        return self.n_crops * self.n_states * self.n_districts * self.n_seasons
+
+    def labels(self, crop, state, district):
+        """Crop labels with state and district folded in (when there are several)"""
+        labels = pd.Series([f'Crop{c:04d}' for c in crop])
+        if self.n_states > 1 or self.n_districts > 1:
+            suffix = [f'State{s:02d}' if self.n_districts == 1 else f'State{s:02d}/D{d:03d}'
+                      for s, d in zip(state, district)]
+            labels = labels + ' (' + pd.Series(suffix) + ')'
+        return labels.to_numpy()
+
+    def chunk(self, start, stop):
+        """Rows [start, stop) as {measure: wide DataFrame}"""
+        rng = np.random.RandomState([self.seed, start])
+        index = np.arange(start, stop)
+        crop, state, district, season = np.unravel_index(
+            index, (self.n_crops, self.n_states, self.n_districts, self.n_seasons))
+        n = len(index)
+
+        level = (self.crop_level[crop] * self.state_effect[state] *
+                 self.district_effect[state, district] * self.season_effect[season])
+        growth = self.crop_growth[crop] + rng.normal(0, 0.01, size=(n, 2))
+        t = np.arange(self.n_years)
+        yields = (level[:, [0]] * (1 + growth[:, [0]]) ** t * self.year_shock *
+                  rng.normal(1, 0.05, size=(n, self.n_years)))
+        areas = level[:, [1]] * (1 + growth[:, [1]]) ** t * rng.normal(1, 0.03, size=(n, self.n_years))
+        productions = areas * yields / 1000
+        missing = rng.rand(n, self.n_years) < self.missing_rate
+
+        keys = pd.DataFrame({'Crop': self.labels(crop, state, district),
+                             'Season': np.asarray(self.seasons, dtype=object)[season]})
+        frames = {}
+        for measure, values in (('Yield', yields), ('Production', productions), ('Area', areas)):
+            values = np.round(values, 2)
+            values[missing] = np.nan
+            columns = pd.DataFrame(values, columns=[year_column(measure, year) for year in self.years])
+            frames[measure] = pd.concat([keys, columns], axis=1)
+        return frames
+
+    def chunks(self, chunk_rows=50000):
+        """Yield the dataset chunk by chunk"""
+        for start in range(0, self.n_rows, chunk_rows):
+            yield self.chunk(start, min(start + chunk_rows, self.n_rows))
+
+
+def generate_raw_data(n_crops=100, n_seasons=4, n_states=1, n_years=10, start_year=2015,
+                      missing_rate=0.05, seed=0, templates=None, n_districts=1, chunk_rows=50000):
+    """Synthetic raw datasets in memory: {'Yield': df, 'Production': df, 'Area': df}
+
+    See SyntheticSpec for how the values are generated. Use
+    stream_raw_data for datasets that should not be held in memory.
+    """
+    spec = SyntheticSpec(n_crops=n_crops, n_seasons=n_seasons, n_states=n_states, n_districts=n_districts,
+                         n_years=n_years, start_year=start_year, missing_rate=missing_rate,
+                         seed=seed, templates=templates)
+    parts = {measure: [] for measure in MEASURES}
+    for frames in spec.chunks(chunk_rows):
+        for measure, frame in frames.items():
+            parts[measure].append(frame)
+    return {measure: pd.concat(frames, ignore_index=True) for measure, frames in parts.items()}
+
+
+def write_raw_data(frames, directory, config=None):
+    """Write generated frames under the raw file names from Config; returns the paths"""
+    os.makedirs(directory, exist_ok=True)
+    paths = {}
+    for measure, frame in frames.items():
+        paths[measure] = raw_path(directory, measure, config)
+        frame.to_csv(paths[measure], index=False, float_format='%.2f')
+    return paths
+
+
+def stream_raw_data(spec, directory, chunk_rows=50000, config=None, progress=None):
+    """Write a SyntheticSpec's dataset chunk by chunk; returns {measure: path}
+
+    Only one chunk is in memory at a time. progress, if given, is called
+    with (rows_written, total_rows) after every chunk.
+    """
+    os.makedirs(directory, exist_ok=True)
+    paths = {measure: raw_path(directory, measure, config) for measure in MEASURES}
+    handles = {measure: open(path, 'w', newline='') for measure, path in paths.items()}
+    try:
+        written = 0
+        for frames in spec.chunks(chunk_rows):
+            for measure, frame in frames.items():
+                frame.to_csv(handles[measure], index=False, header=written == 0, float_format='%.2f')
+            written += len(frames['Yield'])
+            if progress:
+                progress(written, spec.n_rows)
+    finally:
+        for handle in handles.values():
+            handle.close()
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write synthetic raw crop datasets")
+    parser.add_argument("--output-dir", required=True, help="directory for the three raw CSV files")
+    parser.add_argument("--crops", type=int, default=100)
+    parser.add_argument("--seasons", type=int, default=4)
+    parser.add_argument("--states", type=int, default=1)
+    parser.add_argument("--districts", type=int, default=1, help="districts per state")
+    parser.add_argument("--years", type=int, default=10)
+    parser.add_argument("--start-year", type=int, default=2015)
+    parser.add_argument("--missing-rate", type=float, default=0.05)
+    parser.add_argument("--shock-rate", type=float, default=0.1, help="share of years with a yield shock")
+    parser.add_argument("--chunk-rows", type=int, default=50000, help="rows generated and written at a time")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    spec = SyntheticSpec(n_crops=args.crops, n_seasons=args.seasons, n_states=args.states,
+                         n_districts=args.districts, n_years=args.years, start_year=args.start_year,
+                         missing_rate=args.missing_rate, shock_rate=args.shock_rate, seed=args.seed)
+    print(f"🌱 Writing {spec.n_rows:,} rows x {spec.n_years} years to {args.output_dir}")
+
+    def progress(done, total):
+        print(f"  - {done:,}/{total:,} rows", end='\r')
+
+    paths = stream_raw_data(spec, args.output_dir, chunk_rows=args.chunk_rows, progress=progress)
+    print()
+    for measure, path in paths.items():
+        print(f"✅ {measure}: {path} ({os.path.getsize(path) / 1024 ** 2:.1f} MB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -8,15 +8,79 @@ class Config:
     
     # Model paths
     MODEL_DIR = os.path.join(os.path.dirname(__file__), 'saved_models')
-    MODEL_FILE = os.path.join(MODEL_DIR, 'crop_prediction_models.pkl')
+    MODEL_FILE = os.path.join(MODEL_DIR, 'crop_prediction_models.pkl')  # legacy, read-only fallback
+    
+    # Versioned model artifacts: one joblib file per component plus a manifest
+    ARTIFACT_DIR = os.path.join(MODEL_DIR, 'artifacts')
+    ARTIFACT_KEEP = 3       # versions kept on disk
+    MODEL_MMAP_MODE = 'r'   # memory-map model arrays when serving (None to copy)
+    MODEL_WATCH_INTERVAL = 10  # seconds between checks for a new version (0 disables hot reload)
+    
+    # Compiled tree-ensemble inference; sklearn's own predict is faster for
+    # batches larger than COMPILED_MAX_ROWS
+    COMPILED_TREES = True
+    COMPILED_MAX_ROWS = 64
+    
+    # Training worker budget: 1 trains sequentially, -1 uses all cores
+    TRAINING_N_JOBS = 1
+    
+    # Hyperparameter search ('halving' or 'random'; CV 'kfold' or 'time')
+    SEARCH_STRATEGY = 'halving'
+    SEARCH_CANDIDATES = 12
+    SEARCH_CV = 'kfold'
+    SEARCH_CV_SPLITS = 5
+    SEARCH_TIME_BUDGET = 120  # seconds per algorithm and target
+    SEARCH_RESULTS_FILE = os.path.join(MODEL_DIR, 'search_trials.json')
+    
+    # Build lineage (raw input hashes -> processed file -> artifact version),
+    # used to skip processing and training when nothing changed
+    LINEAGE_FILE = 'lineage.json'  # in MODEL_DIR
+    
+    # Incremental retraining: trees/stages added per update, and the size
+    # beyond which a full retrain is done instead
+    INCREMENTAL_ESTIMATORS = 20
+    INCREMENTAL_MAX_ESTIMATORS = 300
     
     # Dashboard settings
     DEBUG = True
     HOST = '127.0.0.1'
     PORT = 8050
+    WARMUP_ON_IMPORT = True  # load models and data in a background thread at import
+    
+    # Production server (gunicorn.conf.py / run_production.py). None sizes
+    # workers from the available cores, capped at GUNICORN_MAX_WORKERS
+    GUNICORN_BIND = '0.0.0.0:8050'
+    GUNICORN_WORKERS = None
+    GUNICORN_MAX_WORKERS = 8
+    GUNICORN_THREADS = 4     # threads per worker (gthread)
+    GUNICORN_TIMEOUT = 60
+    
+    # Opt-in sampling profiler for Dash callbacks (collapsed stacks per callback)
+    PROFILE_CALLBACKS = False
+    PROFILE_INTERVAL = 0.005  # seconds between stack samples
+    PROFILE_DIR = os.path.join(os.path.dirname(__file__), 'profiles')
+    PROFILING_CONTROL_ENABLED = False  # allow POST /profiling to toggle the profiler at runtime
     
     # Data file names
     YIELD_FILE = 'All-India-Yield.csv'
     PRODUCTION_FILE = 'All-India-Production.csv'
     AREA_FILE = 'All-India-Area.csv'
-    MERGED_FILE = 'merged_data.csv'
\ No newline at end of file
+    MERGED_FILE = 'merged_data.csv'
+    MERGED_PARQUET_FILE = 'merged_data.parquet'
+    PROCESSING_STATE_FILE = 'processing_state.json'
+    
+    # Processed data storage ('parquet' or 'csv'); CSV is kept as an export
+    PROCESSED_FORMAT = 'parquet'
+    EXPORT_CSV = False
+    
+    # Streaming ingestion: raw inputs larger than STREAMING_MIN_RAW_MB are read
+    # in chunks of STREAMING_CHUNK_ROWS wide rows and joined one hash
+    # partition of (Crop, Season) keys at a time
+    STREAMING_MIN_RAW_MB = 256
+    STREAMING_CHUNK_ROWS = 50000
+    STREAMING_PARTITIONS = 16
+
+    # Prediction cache settings
+    PREDICTION_CACHE_SIZE = 1024
+    PREDICTION_CACHE_TTL = 600  # seconds
+    FIGURE_CACHE_SIZE = 256
@@ -1,48 +1,31 @@
+import time
+_import_started = time.perf_counter()
+
 import dash
 from dash import dcc, html, Input, Output, State, callback_context
 import dash_bootstrap_components as dbc
+import flask
 import pandas as pd
 import os
 import sys
-import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime
 import json
+import logging
 
 # Add parent directory to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-try:
-    from models.predictor import CropPredictor
-    from config import Config
-except ImportError:
-    # Fallback for demo purposes
-    class CropPredictor:
-        def get_available_options(self):
-            return {
-                'crops': ['Rice', 'Wheat', 'Cotton', 'Sugarcane', 'Maize'],
-                'seasons': ['Kharif', 'Rabi', 'Summer']
-            }
-        
-        def predict(self, crop, season, area, year):
-            import random
-            yield_val = random.randint(2000, 5000)
-            production = yield_val * area * 0.01
-            productivity = production / area if area > 0 else 0
-            
-            return {
-                'predicted_yield': yield_val,
-                'predicted_production': production,
-                'productivity': productivity,
-                'confidence': random.uniform(0.8, 0.95)
-            }
-    
-    class Config:
-        DEBUG = True
-        HOST = '0.0.0.0'
-        PORT = 8050
-        PROCESSED_DATA_DIR = 'dashboard/Data/Processed'
-        MERGED_FILE = 'merged_data.csv'
+from config import Config
+from dashboard.cache import FigureCache, PredictionCache
+from dashboard.profiling import SamplingProfiler, instrument
+from dashboard.startup import LazyResources, StartupTimer
+from models.aggregation import get_cube
+from models.artifacts import model_version
+from models.data_store import get_data_store
+from models.metrics import get_metrics
+from models.model_watcher import ModelWatcher
+from models.predictor import CropPredictor
 
 # Initialize the Dash app with enhanced styling
 app = dash.Dash(
@@ -56,15 +39,43 @@ app = dash.Dash(
 server = app.server
 app.title = "🌾 Smart Crop Analytics Dashboard"
 
-# Initialize predictor and load data
+startup_timer = StartupTimer(started=_import_started)
+startup_timer.record('imports', time.perf_counter() - _import_started)
+
+# The predictor and the processed data are loaded lazily (both share the
+# process-wide data store); the warm-up thread below loads them ahead of
+# the first request
 config = Config()
-predictor = CropPredictor()
+data_store = get_data_store()
+resources = LazyResources(CropPredictor, timer=startup_timer)
+def served_version():
+    """(model version, data version) the predictor is serving
+
+    Taken from the loaded predictor rather than the files on disk, which can
+    be ahead of it: the model watcher and data reloads swap either at any time.
+    """
+    predictor = resources.loaded
+    if predictor is None:
+        return model_version(config), data_store.version
+    return predictor.model_version, predictor.data_version
+
+# Predictions depend on the models and on the trend data, so both versions
+# are part of every key and a change to either clears the cache
+prediction_cache = PredictionCache(
+    served_version,
+    max_size=config.PREDICTION_CACHE_SIZE,
+    ttl=config.PREDICTION_CACHE_TTL
+)
 
-# Load processed data for visualizations
-try:
-    df = pd.read_csv(os.path.join(config.PROCESSED_DATA_DIR, config.MERGED_FILE))
-except:
-    # Generate sample data for demo
+figure_cache = FigureCache(max_size=config.FIGURE_CACHE_SIZE)
+
+logger = logging.getLogger(__name__)
+metrics = get_metrics()
+profiler = SamplingProfiler(config.PROFILE_DIR, interval=config.PROFILE_INTERVAL,
+                            enabled=config.PROFILE_CALLBACKS)
+
+def create_sample_data():
+    """Generate sample data for demo"""
     years = list(range(2015, 2025))
     crops = ['Rice', 'Wheat', 'Cotton', 'Sugarcane', 'Maize']
     seasons = ['Kharif', 'Rabi', 'Summer']
@@ -83,10 +94,48 @@ except:
                     'Area': random.randint(50, 200)
                 })
     
-    df = pd.DataFrame(data)
+    return pd.DataFrame(data)
+
+sample_df = None
+
+def current_data():
+    """Return (frame, version) for the charts, falling back to sample data"""
+    global sample_df
+    if data_store.frame is None:
+        if sample_df is None:
+            sample_df = create_sample_data()
+        return sample_df, 'sample'
+    return data_store.frame, data_store.version
+
+# Warm-up: load the shared data, aggregate it once (chart callbacks read
+# from the cube), then load the models
+resources.add_step('data_load', lambda: data_store.frame)
+resources.add_step('aggregation', lambda: get_cube(current_data()[0]))
+if config.WARMUP_ON_IMPORT:
+    resources.start_warmup()
+
+# Hot reload of new model versions; started per serving process (threads
+# do not survive fork, so gunicorn workers start it in post_fork)
+model_watcher = ModelWatcher(lambda: resources.predictor, interval=config.MODEL_WATCH_INTERVAL)
 
-# Get available options
-options = predictor.get_available_options()
+def start_model_watcher():
+    """Start watching for new model versions in this process"""
+    return model_watcher.start()
+
+def reload_resources():
+    """Reload the processed data and models from disk (e.g. on SIGHUP)"""
+    data_store.reload()
+    figure_cache.clear()
+    return resources.reload()
+
+def refresh_data_if_changed():
+    """Reload the processed data if its file changed and return the data version"""
+    if data_store.refresh_if_changed():
+        resources.predictor.load_historical_data()
+        df, _ = current_data()
+        get_cube(df)
+        logger.info(f"🔄 Processed data changed, reloaded ({len(df)} rows)")
+    return current_data()[1]
 
 def create_enhanced_filters(crops, seasons):
     """Create beautiful filter components"""
@@ -281,10 +330,11 @@ def create_enhanced_prediction_cards():
 
 def create_enhanced_trend_chart(df, crop, metric):
     """Create enhanced trend chart"""
-    if df.empty or crop not in df['Crop'].values:
+    cube = get_cube(df)
+    if cube.empty or crop not in cube.crops:
         return go.Figure()
     
-    crop_data = df[df['Crop'] == crop].groupby('Year')[metric].mean().reset_index()
+    crop_data = cube.crop_by_year(crop, metric)
     
     fig = go.Figure()
     
@@ -338,10 +388,11 @@ def create_enhanced_trend_chart(df, crop, metric):
 
 def create_enhanced_comparison_chart(df, season):
     """Create enhanced comparison chart"""
-    if df.empty or season not in df['Season'].values:
+    cube = get_cube(df)
+    if cube.empty or season not in cube.seasons:
         return go.Figure()
     
-    season_data = df[df['Season'] == season].groupby('Crop')[['Yield', 'Production']].mean().reset_index()
+    season_data = cube.season_by_crop(season, ['Yield', 'Production'])
     
     fig = go.Figure()
     
@@ -381,141 +432,157 @@ def create_enhanced_comparison_chart(df, season):
     
     return fig
 
-# Define the layout
-app.layout = html.Div([
-    html.Div([
-        dbc.Container([
-            # Header Section
-            html.Div([
-                html.H1([
-                    html.I(className="fas fa-seedling me-3"),
-                    "Smart Crop Analytics Dashboard"
-                ], className="display-3 fw-bold text-white mb-3 text-center",
-                   style={'textShadow': '0 4px 15px rgba(0,0,0,0.2)'}),
-                html.P("Predict crop yield and production using advanced machine learning", 
-                       className="lead text-white text-center mb-2",
-                       style={'opacity': '0.9'}),
-                html.P(f"Last updated: {datetime.now().strftime('%B %d, %Y at %I:%M %p')}", 
-                       className="text-white text-center small mb-5",
-                       style={'opacity': '0.7'})
-            ], className="mb-5"),
-            
-            # Filters Section
-            dbc.Card([
-                dbc.CardBody([
-                    create_enhanced_filters(options['crops'], options['seasons'])
-                ])
-            ], style={
-                'background': 'rgba(255, 255, 255, 0.15)',
-                'backdropFilter': 'blur(15px)',
-                'border': '1px solid rgba(255, 255, 255, 0.2)',
-                'borderRadius': '25px',
-                'boxShadow': '0 15px 35px rgba(0,0,0,0.1)'
-            }, className="mb-5"),
-            
-            # Prediction Button
-            dbc.Row([
-                dbc.Col([
-                    html.Div([
-                        dbc.Button([
-                            html.I(className="fas fa-magic me-2"),
-                            "Generate Prediction"
-                        ], id="predict-button", 
-                           color="primary", 
-                           size="lg",
-                           className="w-100",
-                           style={
-                               'background': 'linear-gradient(135deg, #4facfe, #00f2fe)',
-                               'border': 'none',
-                               'borderRadius': '30px',
-                               'padding': '18px 40px',
-                               'fontSize': '18px',
-                               'fontWeight': '700',
-                               'textTransform': 'uppercase',
-                               'letterSpacing': '1px',
-                               'boxShadow': '0 8px 25px rgba(79, 172, 254, 0.4)',
-                               'transition': 'all 0.3s ease'
-                           },
-                           n_clicks=0),
-                        html.Div(id="prediction-status", className="mt-3 text-center")
+def build_layout(options, data_version):
+    """Build the page layout for the given crop/season options"""
+    return html.Div([
+        html.Div([
+            dbc.Container([
+                # Header Section
+                html.Div([
+                    html.H1([
+                        html.I(className="fas fa-seedling me-3"),
+                        "Smart Crop Analytics Dashboard"
+                    ], className="display-3 fw-bold text-white mb-3 text-center",
+                       style={'textShadow': '0 4px 15px rgba(0,0,0,0.2)'}),
+                    html.P("Predict crop yield and production using advanced machine learning", 
+                           className="lead text-white text-center mb-2",
+                           style={'opacity': '0.9'}),
+                    html.P(f"Last updated: {datetime.now().strftime('%B %d, %Y at %I:%M %p')}", 
+                           className="text-white text-center small mb-5",
+                           style={'opacity': '0.7'})
+                ], className="mb-5"),
+                
+                # Filters Section
+                dbc.Card([
+                    dbc.CardBody([
+                        create_enhanced_filters(options['crops'], options['seasons'])
                     ])
-                ], md={'size': 6, 'offset': 3})
-            ], className="mb-5"),
-            
-            # Results Section
-            html.Div(id="results-container", children=[
-                create_enhanced_prediction_cards()
-            ]),
-            
-            # Charts Section
-            dbc.Row([
-                dbc.Col([
-                    dbc.Card([
-                        dbc.CardHeader([
-                            html.I(className="fas fa-chart-line me-2 text-white"),
-                            html.H4("Trend Analysis", className="mb-0 d-inline text-white")
-                        ], style={
-                            'background': 'linear-gradient(135deg, #667eea, #764ba2)',
-                            'borderRadius': '25px 25px 0 0',
-                            'border': 'none'
-                        }),
-                        dbc.CardBody([
-                            dcc.Graph(id="trend-chart", config={'displayModeBar': False})
-                        ], style={'padding': '30px'})
-                    ], style={
-                        'background': 'white',
-                        'borderRadius': '25px',
-                        'border': 'none',
-                        'boxShadow': '0 15px 35px rgba(0,0,0,0.1)',
-                        'transition': 'transform 0.3s ease, box-shadow 0.3s ease'
-                    }, className="chart-card")
-                ], md=6),
+                ], style={
+                    'background': 'rgba(255, 255, 255, 0.15)',
+                    'backdropFilter': 'blur(15px)',
+                    'border': '1px solid rgba(255, 255, 255, 0.2)',
+                    'borderRadius': '25px',
+                    'boxShadow': '0 15px 35px rgba(0,0,0,0.1)'
+                }, className="mb-5"),
+                
+                # Prediction Button
+                dbc.Row([
+                    dbc.Col([
+                        html.Div([
+                            dbc.Button([
+                                html.I(className="fas fa-magic me-2"),
+                                "Generate Prediction"
+                            ], id="predict-button", 
+                               color="primary", 
+                               size="lg",
+                               className="w-100",
+                               style={
+                                   'background': 'linear-gradient(135deg, #4facfe, #00f2fe)',
+                                   'border': 'none',
+                                   'borderRadius': '30px',
+                                   'padding': '18px 40px',
+                                   'fontSize': '18px',
+                                   'fontWeight': '700',
+                                   'textTransform': 'uppercase',
+                                   'letterSpacing': '1px',
+                                   'boxShadow': '0 8px 25px rgba(79, 172, 254, 0.4)',
+                                   'transition': 'all 0.3s ease'
+                               },
+                               n_clicks=0),
+                            html.Div(id="prediction-status", className="mt-3 text-center")
+                        ])
+                    ], md={'size': 6, 'offset': 3})
+                ], className="mb-5"),
+                
+                # Results Section
+                html.Div(id="results-container", children=[
+                    create_enhanced_prediction_cards()
+                ]),
                 
-                dbc.Col([
-                    dbc.Card([
-                        dbc.CardHeader([
-                            html.I(className="fas fa-chart-bar me-2 text-white"),
-                            html.H4("Crop Comparison", className="mb-0 d-inline text-white")
+                # Charts Section
+                dbc.Row([
+                    dbc.Col([
+                        dbc.Card([
+                            dbc.CardHeader([
+                                html.I(className="fas fa-chart-line me-2 text-white"),
+                                html.H4("Trend Analysis", className="mb-0 d-inline text-white")
+                            ], style={
+                                'background': 'linear-gradient(135deg, #667eea, #764ba2)',
+                                'borderRadius': '25px 25px 0 0',
+                                'border': 'none'
+                            }),
+                            dbc.CardBody([
+                                dcc.Graph(id="trend-chart", config={'displayModeBar': False})
+                            ], style={'padding': '30px'})
                         ], style={
-                            'background': 'linear-gradient(135deg, #4ecdc4, #44a08d)',
-                            'borderRadius': '25px 25px 0 0',
-                            'border': 'none'
-                        }),
-                        dbc.CardBody([
-                            dcc.Graph(id="comparison-chart", config={'displayModeBar': False})
-                        ], style={'padding': '30px'})
-                    ], style={
-                        'background': 'white',
-                        'borderRadius': '25px',
-                        'border': 'none',
-                        'boxShadow': '0 15px 35px rgba(0,0,0,0.1)',
-                        'transition': 'transform 0.3s ease, box-shadow 0.3s ease'
-                    }, className="chart-card")
-                ], md=6)
-            ], className="mb-5"),
-            
-            # Footer
-            html.Hr(style={'border': '1px solid rgba(255,255,255,0.2)', 'margin': '50px 0 20px 0'}),
-            html.Div([
-                html.P([
-                    html.I(className="fas fa-leaf me-2"),
-                    "Powered by Advanced Machine Learning & Agricultural Data Science"
-                ], className="text-center text-white mb-0",
-                   style={'opacity': '0.7', 'fontSize': '14px'})
-            ])
-            
-        ], fluid=True)
-    ], style={
-        'background': 'linear-gradient(135deg, #667eea 0%, #764ba2 100%)',
-        'minHeight': '100vh',
-        'padding': '20px 0',
-        'fontFamily': 'Inter, sans-serif'
-    }),
-    
-    # Store for results
-    dcc.Store(id='prediction-store'),
-    dcc.Interval(id='interval-component', interval=30*1000, n_intervals=0)
-])
+                            'background': 'white',
+                            'borderRadius': '25px',
+                            'border': 'none',
+                            'boxShadow': '0 15px 35px rgba(0,0,0,0.1)',
+                            'transition': 'transform 0.3s ease, box-shadow 0.3s ease'
+                        }, className="chart-card")
+                    ], md=6),
+                    
+                    dbc.Col([
+                        dbc.Card([
+                            dbc.CardHeader([
+                                html.I(className="fas fa-chart-bar me-2 text-white"),
+                                html.H4("Crop Comparison", className="mb-0 d-inline text-white")
+                            ], style={
+                                'background': 'linear-gradient(135deg, #4ecdc4, #44a08d)',
+                                'borderRadius': '25px 25px 0 0',
+                                'border': 'none'
+                            }),
+                            dbc.CardBody([
+                                dcc.Graph(id="comparison-chart", config={'displayModeBar': False})
+                            ], style={'padding': '30px'})
+                        ], style={
+                            'background': 'white',
+                            'borderRadius': '25px',
+                            'border': 'none',
+                            'boxShadow': '0 15px 35px rgba(0,0,0,0.1)',
+                            'transition': 'transform 0.3s ease, box-shadow 0.3s ease'
+                        }, className="chart-card")
+                    ], md=6)
+                ], className="mb-5"),
+                
+                # Footer
+                html.Hr(style={'border': '1px solid rgba(255,255,255,0.2)', 'margin': '50px 0 20px 0'}),
+                html.Div([
+                    html.P([
+                        html.I(className="fas fa-leaf me-2"),
+                        "Powered by Advanced Machine Learning & Agricultural Data Science"
+                    ], className="text-center text-white mb-0",
+                       style={'opacity': '0.7', 'fontSize': '14px'})
+                ])
+                
+            ], fluid=True)
+        ], style={
+            'background': 'linear-gradient(135deg, #667eea 0%, #764ba2 100%)',
+            'minHeight': '100vh',
+            'padding': '20px 0',
+            'fontFamily': 'Inter, sans-serif'
+        }),
+        
+        # Store for results
+        dcc.Store(id='prediction-store'),
+        dcc.Store(id='data-version', data=data_version),
+        dcc.Interval(id='interval-component', interval=30*1000, n_intervals=0)
+    ])
+
+def serve_layout():
+    """Build the layout on page load, once the predictor is available"""
+    # Dash also resolves the layout on the very first request to any route
+    # (e.g. a /ready probe); only an actual layout request waits for warm-up
+    if not resources.ready and not flask.request.path.endswith('_dash-layout'):
+        return app.validation_layout
+    options = resources.predictor.get_available_options()
+    return build_layout(options, current_data()[1])
+
+# Dash validates callbacks against a static copy of the layout, so serving
+# a layout function does not load anything at import time
+app.validation_layout = build_layout({'crops': [], 'seasons': []}, None)
+app.layout = serve_layout
 
 # Enhanced callbacks
 @app.callback(
@@ -533,6 +600,7 @@ app.layout = html.Div([
      State('area-input', 'value'),
      State('year-input', 'value')]
 )
+@instrument('make_enhanced_prediction', profiler)
 def make_enhanced_prediction(n_clicks, crop, season, area, year):
     if not n_clicks:
         return ("Ready to predict", "Ready to predict", "Ready to predict", {}, 
@@ -547,7 +615,7 @@ def make_enhanced_prediction(n_clicks, crop, season, area, year):
                 error_msg, "", "", "")
     
     try:
-        result = predictor.predict(crop, season, area, year)
+        result = prediction_cache.get_or_predict(resources.predictor, crop, season, area, year)
         
         if 'error' in result:
             error_msg = html.Div([
@@ -587,6 +655,48 @@ def make_enhanced_prediction(n_clicks, crop, season, area, year):
         return ("System Error", "System Error", "System Error", {}, 
                 error_msg, "", "", "")
 
+@server.route('/cache-stats')
+def cache_stats():
+    """Expose prediction cache counters"""
+    return prediction_cache.stats()
+
+@server.route('/ready')
+def ready():
+    """Readiness probe: 200 once models and data are loaded, 503 until then"""
+    status = resources.status()
+    return status, 200 if status['ready'] else 503
+
+@server.route('/metrics')
+def metrics_endpoint():
+    """Prediction/callback latency summaries, counters and cache gauges (Prometheus text format)"""
+    for cache_name, cache in (('prediction', prediction_cache), ('figure', figure_cache)):
+        for stat, value in cache.stats().items():
+            metrics.set_gauge(f'dashboard_cache_{stat}', value, cache=cache_name)
+    metrics.set_gauge('dashboard_ready', int(resources.ready))
+    metrics.set_gauge('data_store_memory_bytes', data_store.memory_usage())
+    return flask.Response(metrics.render(), mimetype='text/plain; version=0.0.4')
+
+@server.route('/profiling', methods=['GET', 'POST'])
+def profiling():
+    """Profiler status; POST ?enabled=1|0 toggles it (Config.PROFILING_CONTROL_ENABLED only)"""
+    if flask.request.method == 'POST':
+        if not config.PROFILING_CONTROL_ENABLED:
+            return {'error': 'Runtime profiling control is disabled (Config.PROFILING_CONTROL_ENABLED)'}, 403
+        profiler.set_enabled(flask.request.args.get('enabled', '1') not in ('0', 'false', 'off'))
+    return profiler.status()
+
+@server.route('/model-status')
+def model_status():
+    """Model version being served and hot-reload activity"""
+    if not resources.ready:
+        return {'ready': False}, 503
+    return model_watcher.status()
+
+@server.route('/data-stats')
+def data_stats():
+    """Expose what the shared data store holds and its memory footprint"""
+    return data_store.report()
+
 def create_confidence_bar(confidence, color_type):
     """Create confidence indicator bar"""
     confidence_percent = confidence * 100
@@ -609,25 +719,46 @@ def create_confidence_bar(confidence, color_type):
         )
     ])
 
+@app.callback(
+    Output('data-version', 'data'),
+    [Input('interval-component', 'n_intervals')],
+    [State('data-version', 'data')]
+)
+@instrument('check_data_version', profiler)
+def check_data_version(n_intervals, client_version):
+    """Only push a new version (and so re-render charts) when the data changed"""
+    if not resources.ready:
+        return dash.no_update
+    version = refresh_data_if_changed()
+    if version == client_version:
+        return dash.no_update
+    return version
+
 @app.callback(
     Output('trend-chart', 'figure'),
     [Input('crop-dropdown', 'value'),
-     Input('interval-component', 'n_intervals')]
+     Input('data-version', 'data')]
 )
-def update_trend_chart(crop, n_intervals):
+@instrument('update_trend_chart', profiler)
+def update_trend_chart(crop, version):
     if not crop:
         return go.Figure()
-    return create_enhanced_trend_chart(df, crop, 'Yield')
+    df, data_version = current_data()
+    key = ('trend', crop, 'Yield', data_version)
+    return figure_cache.get_or_build(key, lambda: create_enhanced_trend_chart(df, crop, 'Yield'))
 
 @app.callback(
     Output('comparison-chart', 'figure'),
     [Input('season-dropdown', 'value'),
-     Input('interval-component', 'n_intervals')]
+     Input('data-version', 'data')]
 )
-def update_comparison_chart(season, n_intervals):
+@instrument('update_comparison_chart', profiler)
+def update_comparison_chart(season, version):
     if not season:
         return go.Figure()
-    return create_enhanced_comparison_chart(df, season)
+    df, data_version = current_data()
+    key = ('comparison', season, 'Yield', data_version)
+    return figure_cache.get_or_build(key, lambda: create_enhanced_comparison_chart(df, season))
 
 # Quick area selection callbacks
 @app.callback(
@@ -637,6 +768,7 @@ def update_comparison_chart(season, n_intervals):
      Input('area-large', 'n_clicks')],
     prevent_initial_call=True
 )
+@instrument('update_area_quick_select', profiler)
 def update_area_quick_select(small, medium, large):
     ctx = callback_context
     if not ctx.triggered:
@@ -661,6 +793,7 @@ def update_area_quick_select(small, medium, large):
      Input('year-next5', 'n_clicks')],
     prevent_initial_call=True
 )
+@instrument('update_year_quick_select', profiler)
 def update_year_quick_select(next1, next2, next5):
     ctx = callback_context
     if not ctx.triggered:
@@ -679,6 +812,8 @@ def update_year_quick_select(next1, next2, next5):
     return current_year + 1
 
 if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    start_model_watcher()
     try:
         app.run_server(debug=config.DEBUG, host=config.HOST, port=config.PORT)
     except:
@@ -0,0 +1,143 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+
+
+class LRUCache:
+    """Thread-safe bounded cache with LRU and optional TTL eviction"""
+
+    def __init__(self, max_size=256, ttl=None):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key, default=None):
+        """Return the cached value for key, or default on a miss"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+
+            value, stored_at = entry
+            if self.ttl is not None and time.monotonic() - stored_at > self.ttl:
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return default
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        """Store value under key, evicting the least recently used entries"""
+        with self._lock:
+            self._entries[key] = (value, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """Drop all entries (counters are kept)"""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False
+            return self.ttl is None or time.monotonic() - entry[1] <= self.ttl
+
+    def stats(self):
+        """Return hit/miss/eviction counters and current size"""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'size': len(self._entries),
+                'max_size': self.max_size
+            }
+
+
+class PredictionCache(LRUCache):
+    """Cache of predictor results keyed on normalized inputs and a version stamp
+
+    The version stamp (from the version_func callable, which must be cheap;
+    e.g. the model and data versions being served) is part of every key, and
+    the cache is cleared as soon as a different version is seen, so results
+    computed with older models or data are never served.
+    """
+
+    def __init__(self, version_func, max_size=1024, ttl=600):
+        super().__init__(max_size=max_size, ttl=ttl)
+        self.version_func = version_func
+        self.model_version = version_func()
+        self.invalidations = 0
+
+    @staticmethod
+    def normalize(crop, season, area, year):
+        """Normalize raw callback inputs into a hashable cache key
+
+        The year stays a float: 2023 and 2023.0 share an entry, but a
+        fractional year is never served the prediction of its integer part.
+        """
+        return (str(crop).strip(), str(season).strip(), float(area), float(year))
+
+    def check_model_version(self):
+        """Clear the cache if the served models or data changed since the last lookup"""
+        version = self.version_func()
+        if version != self.model_version:
+            self.clear()
+            self.model_version = version
+            self.invalidations += 1
+        return version
+
+    def get_or_predict(self, predictor, crop, season, area, year):
+        """Return a cached prediction, calling predictor.predict on a miss"""
+        version = self.check_model_version()
+        key = self.normalize(crop, season, area, year) + (version,)
+
+        result = self.get(key)
+        if result is None:
+            result = predictor.predict(crop, season, area, year)
+            # Errors are cheap to recompute and may be transient (e.g. models not loaded yet)
+            if 'error' not in result:
+                self.set(key, result)
+
+        return dict(result)
+
+    def stats(self):
+        """Return counters including model-version invalidations"""
+        stats = super().stats()
+        stats['invalidations'] = self.invalidations
+        return stats
+
+
+class FigureCache(LRUCache):
+    """Cache of serialized Plotly figures keyed on chart inputs and data version"""
+
+    def get_or_build(self, key, builder):
+        """Return the cached figure dict for key, calling builder() on a miss
+
+        Figures are stored already serialized to plain JSON types, so a hit
+        skips both the pandas work and Plotly's figure serialization.
+        """
+        figure = self.get(key)
+        if figure is None:
+            figure = json.loads(builder().to_json())
+            self.set(key, figure)
+        return figure
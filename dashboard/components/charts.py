@@ -4,13 +4,15 @@ import plotly.graph_objects as go
 import pandas as pd
 from plotly.subplots import make_subplots
 import numpy as np
+from models.aggregation import get_cube
 
 def create_enhanced_trend_chart(df, crop, metric):
     """Create stunning trend chart with animations and enhanced visuals"""
-    if df.empty or crop not in df['Crop'].values:
+    cube = get_cube(df)
+    if cube.empty or crop not in cube.crops:
         return create_empty_chart("No data available for selected crop")
     
-    crop_data = df[df['Crop'] == crop].groupby('Year')[metric].mean().reset_index()
+    crop_data = cube.crop_by_year(crop, metric)
     
     # Calculate moving average for smoother trend
     if len(crop_data) >= 3:
@@ -155,10 +157,11 @@ def create_enhanced_trend_chart(df, crop, metric):
 
 def create_enhanced_comparison_chart(df, season):
     """Create stunning comparison chart with multiple metrics"""
-    if df.empty or season not in df['Season'].values:
+    cube = get_cube(df)
+    if cube.empty or season not in cube.seasons:
         return create_empty_chart("No data available for selected season")
     
-    season_data = df[df['Season'] == season].groupby('Crop')[['Yield', 'Production', 'Area']].mean().reset_index()
+    season_data = cube.season_by_crop(season, ['Yield', 'Production', 'Area'])
     season_data = season_data.sort_values('Yield', ascending=True)  # Sort for better visualization
     
     # Create subplot with secondary y-axis
@@ -280,25 +283,26 @@ def create_enhanced_comparison_chart(df, season):
 
 def create_productivity_radar_chart(df, crops_list, season):
     """Create radar chart for crop productivity comparison"""
-    if df.empty or season not in df['Season'].values:
+    cube = get_cube(df)
+    if cube.empty or season not in cube.seasons:
         return create_empty_chart("No data available")
     
-    season_data = df[df['Season'] == season]
     metrics = ['Yield', 'Production', 'Area']
+    crop_means = cube.season_by_crop(season, metrics).set_index('Crop')
     
     fig = go.Figure()
     
     colors = ['#667eea', '#4ecdc4', '#f093fb', '#4facfe', '#feca57']
     
     for i, crop in enumerate(crops_list[:5]):  # Limit to 5 crops for clarity
-        if crop in season_data['Crop'].values:
-            crop_metrics = season_data[season_data['Crop'] == crop][metrics].mean()
+        if crop in crop_means.index:
+            crop_metrics = crop_means.loc[crop]
             
             # Normalize values (0-100 scale)
             normalized_values = []
             for metric in metrics:
-                max_val = season_data[metric].max()
-                min_val = season_data[metric].min()
+                max_val = cube.season_stat(season, metric, 'max')
+                min_val = cube.season_stat(season, metric, 'min')
                 if max_val > min_val:
                     norm_val = ((crop_metrics[metric] - min_val) / (max_val - min_val)) * 100
                 else:
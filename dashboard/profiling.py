@@ -0,0 +1,125 @@
+import functools
+import logging
+import os
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from dash.exceptions import PreventUpdate
+from models.metrics import get_metrics
+
+logger = logging.getLogger(__name__)
+
+
+class SamplingProfiler:
+    """Opt-in sampling profiler for Dash callbacks
+
+    While enabled, a daemon thread wakes every interval seconds and records
+    the Python stack of each thread that is inside a profiled callback.
+    Samples are aggregated per callback and written to
+    <output_dir>/<callback>.folded in the collapsed-stack format read by
+    flamegraph tools (one "frame;frame;frame count" line per stack).
+    Disabled, profile() costs a single attribute check.
+    """
+
+    def __init__(self, output_dir, interval=0.005, enabled=False):
+        self.output_dir = output_dir
+        self.interval = interval
+        self.enabled = enabled
+        self.stacks = defaultdict(Counter)
+        self._active = {}
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def set_enabled(self, enabled):
+        self.enabled = bool(enabled)
+        logger.info(f"🔬 Callback profiling {'enabled' if self.enabled else 'disabled'}")
+
+    @contextmanager
+    def profile(self, name):
+        """Sample the current thread's stack while the block runs"""
+        if not self.enabled:
+            yield
+            return
+
+        thread_id = threading.get_ident()
+        with self._lock:
+            self._active[thread_id] = name
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._sample, name='callback-profiler', daemon=True)
+                self._thread.start()
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._active.pop(thread_id, None)
+            self.dump(name)
+
+    def _sample(self):
+        while self.enabled:
+            time.sleep(self.interval)
+            with self._lock:
+                active = dict(self._active)
+            if not active:
+                continue
+            frames = sys._current_frames()
+            for thread_id, name in active.items():
+                frame = frames.get(thread_id)
+                if frame is not None:
+                    stack = _fold(frame)
+                    with self._lock:
+                        self.stacks[name][stack] += 1
+
+    def dump(self, name):
+        """Write the aggregated samples of one callback; returns the path"""
+        with self._lock:
+            samples = dict(self.stacks.get(name, {}))
+        if not samples:
+            return None
+        os.makedirs(self.output_dir, exist_ok=True)
+        path = os.path.join(self.output_dir, f'{name}.folded')
+        with open(path, 'w') as f:
+            for stack, count in sorted(samples.items(), key=lambda item: -item[1]):
+                f.write(f'{stack} {count}\n')
+        return path
+
+    def status(self):
+        with self._lock:
+            samples = {name: sum(counter.values()) for name, counter in self.stacks.items()}
+        return {'enabled': self.enabled, 'interval': self.interval,
+                'output_dir': self.output_dir, 'samples': samples}
+
+
+def _fold(frame):
+    """Collapse a frame's stack (outermost first) into a;b;c form"""
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f'{code.co_name} ({os.path.basename(code.co_filename)})')
+        frame = frame.f_back
+    return ';'.join(reversed(names))
+
+
+def instrument(name, profiler=None, metrics=None):
+    """Decorator timing a Dash callback, counting its errors and optionally profiling it"""
+    metrics = metrics or get_metrics()
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                if profiler is not None and profiler.enabled:
+                    with profiler.profile(name):
+                        return func(*args, **kwargs)
+                return func(*args, **kwargs)
+            except PreventUpdate:
+                raise
+            except Exception:
+                metrics.inc('dashboard_callback_errors_total', callback=name)
+                raise
+            finally:
+                metrics.observe('dashboard_callback_seconds', time.perf_counter() - start, callback=name)
+        return wrapper
+    return decorator
@@ -0,0 +1,146 @@
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+
+class StartupTimer:
+    """Wall-clock duration of each dashboard startup phase"""
+
+    def __init__(self, started=None):
+        self.started = time.perf_counter() if started is None else started
+        self.phases = {}
+        self._lock = threading.Lock()
+
+    def record(self, name, seconds):
+        with self._lock:
+            self.phases[name] = round(seconds, 4)
+
+    @contextmanager
+    def phase(self, name):
+        """Time the enclosed block as one phase"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def report(self):
+        """Phase durations plus seconds since the process started importing"""
+        with self._lock:
+            phases = dict(self.phases)
+        return {'phases': phases, 'uptime': round(time.perf_counter() - self.started, 4)}
+
+    def describe(self):
+        return ', '.join(f"{name} {seconds:.2f}s" for name, seconds in self.report()['phases'].items())
+
+
+class LazyResources:
+    """Predictor and data built on first use or by a background warm-up
+
+    Nothing expensive happens on construction, so importing the app is
+    cheap and the server can answer health checks immediately. The
+    predictor is built the first time it is needed; start_warmup builds it
+    (after the registered warm-up steps, e.g. loading the processed data)
+    in a daemon thread so the first user request usually finds it ready.
+    Callers needing the predictor before the warm-up finished block on the
+    same lock instead of building a second one.
+    """
+
+    def __init__(self, predictor_factory, timer=None):
+        self.predictor_factory = predictor_factory
+        self.timer = timer or StartupTimer()
+        self.steps = []
+        self.error = None
+        self._predictor = None
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self._thread = None
+
+    def add_step(self, name, func):
+        """Register a warm-up step, timed as its own startup phase"""
+        self.steps.append((name, func))
+
+    @property
+    def predictor(self):
+        """The predictor, built on first access"""
+        if self._predictor is None:
+            with self._lock:
+                if self._predictor is None:
+                    with self.timer.phase('model_load'):
+                        self._predictor = self.predictor_factory()
+        return self._predictor
+
+    @property
+    def loaded(self):
+        """The predictor if it has been built, without building it"""
+        return self._predictor
+
+    @property
+    def ready(self):
+        return self._ready.is_set()
+
+    def wait(self, timeout=None):
+        """Block until the warm-up finished; returns True if ready"""
+        return self._ready.wait(timeout)
+
+    def warm_up(self):
+        """Run every warm-up step, then build the predictor"""
+        try:
+            for name, func in self.steps:
+                with self.timer.phase(name):
+                    func()
+            self.predictor
+            self._ready.set()
+            logger.info(f"✅ Dashboard ready ({self.timer.describe()})")
+        except Exception as e:
+            self.error = str(e)
+            logger.error(f"❌ Dashboard warm-up failed: {e}")
+
+    def start_warmup(self):
+        """Run warm_up in a background thread (once per process)"""
+        if self._thread is None or (not self._thread.is_alive() and not self.ready):
+            self._thread = threading.Thread(target=self.warm_up, name='dashboard-warmup', daemon=True)
+            self._thread.start()
+        return self._thread
+
+    def finish_warmup(self, timeout=None):
+        """Run the warm-up now, or wait for the running one; returns True if ready
+
+        Called before forking worker processes: a warm-up thread does not
+        survive fork, and forking while it holds the predictor lock would
+        leave that lock held forever in the children.
+        """
+        thread = self.start_warmup()
+        thread.join(timeout)
+        return self.ready
+
+    def reload(self):
+        """Re-run the warm-up steps and swap in a freshly built predictor
+
+        The old predictor keeps serving until the new one is complete, so
+        a failed reload leaves the process running on the previous models.
+        """
+        try:
+            with self.timer.phase('reload'):
+                for name, func in self.steps:
+                    func()
+                predictor = self.predictor_factory()
+            with self._lock:
+                self._predictor = predictor
+            self.error = None
+            self._ready.set()
+            logger.info(f"🔄 Resources reloaded ({self.timer.describe()})")
+            return True
+        except Exception as e:
+            logger.error(f"❌ Reload failed, keeping the previous predictor: {e}")
+            return False
+
+    def status(self):
+        """Readiness and the startup-time report"""
+        status = {'ready': self.ready, 'startup': self.timer.report()}
+        if self.error:
+            status['error'] = self.error
+        return status
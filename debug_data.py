@@ -5,6 +5,7 @@ Debug script to check data and models
 import pandas as pd
 import os
 from config import Config
+from models.storage import find_processed_data, read_processed_data
 
 def debug_data():
     """Debug data loading and processing"""
@@ -43,11 +44,11 @@ def debug_data():
     # Check processed data
     print("\n2. Checking Processed Data:")
     print("-" * 30)
-    processed_file = os.path.join(config.PROCESSED_DATA_DIR, config.MERGED_FILE)
-    if os.path.exists(processed_file):
+    processed_file = find_processed_data(config)
+    if processed_file is not None:
         try:
-            df = pd.read_csv(processed_file)
-            print(f"   ✅ Processed data exists: {df.shape}")
+            df = read_processed_data(processed_file)
+            print(f"   ✅ Processed data exists: {df.shape} ({os.path.basename(processed_file)})")
             print(f"   Unique crops: {df['Crop'].nunique()}")
             print(f"   Crops: {list(df['Crop'].unique())}")
             print(f"   Unique seasons: {df['Season'].nunique()}")
@@ -60,13 +61,11 @@ def debug_data():
     # Check models
     print("\n3. Checking Models:")
     print("-" * 30)
-    model_file = config.MODEL_FILE
-    if os.path.exists(model_file):
+    from models.artifacts import load_model_bundle, models_available
+    if models_available(config):
         try:
-            import pickle
-            with open(model_file, 'rb') as f:
-                models = pickle.load(f)
-            print("   ✅ Models loaded successfully")
+            models, source = load_model_bundle(config)
+            print(f"   ✅ Models loaded successfully from {source}")
             print(f"   Available keys: {list(models.keys())}")
             
             if 'crop_encoder' in models:
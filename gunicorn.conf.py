@@ -0,0 +1,75 @@
+"""
+Gunicorn settings for the production dashboard (started by run_production.py)
+
+    gunicorn -c gunicorn.conf.py
+
+The app is imported once in the master (preload_app) and the models and
+processed data are loaded there before any worker is forked, so every
+worker shares them copy-on-write instead of loading its own copy.
+`kill -HUP <master pid>` reloads models and data in the master and then
+replaces the workers gracefully (in-flight requests finish on the old ones).
+Each worker also hot-swaps newly published model versions on its own (see
+models/model_watcher.py), so retraining needs no signal at all.
+"""
+import gc
+import os
+from config import Config
+
+
+def available_cores():
+    """CPU cores this process may run on"""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def worker_count(config=Config):
+    """Workers from WEB_CONCURRENCY, Config.GUNICORN_WORKERS or one per core"""
+    if os.environ.get('WEB_CONCURRENCY'):
+        return int(os.environ['WEB_CONCURRENCY'])
+    if config.GUNICORN_WORKERS:
+        return config.GUNICORN_WORKERS
+    return max(1, min(available_cores(), config.GUNICORN_MAX_WORKERS))
+
+
+wsgi_app = 'run_dashboard:server'
+bind = os.environ.get('GUNICORN_BIND', Config.GUNICORN_BIND)
+
+# Prediction and chart callbacks are CPU-bound under the GIL: one process per
+# core, plus a few threads each so slow requests do not block fast ones
+workers = worker_count()
+worker_class = 'gthread'
+threads = Config.GUNICORN_THREADS
+timeout = Config.GUNICORN_TIMEOUT
+graceful_timeout = 30
+
+preload_app = True
+accesslog = '-'
+
+
+def on_starting(server):
+    """Finish loading models and data in the master before workers are forked"""
+    from dashboard.app import resources
+
+    if not resources.finish_warmup():
+        server.log.warning("Warm-up did not complete; workers will load resources on first use")
+    # Keep the garbage collector from touching (and so copying) the shared objects
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    """Watch for new model versions in each worker (threads do not survive fork)"""
+    from dashboard.app import start_model_watcher
+
+    start_model_watcher()
+
+
+def on_reload(server):
+    """SIGHUP: reload models and data in the master; gunicorn then replaces the workers"""
+    from dashboard.app import reload_resources
+
+    gc.unfreeze()
+    reload_resources()
+    gc.collect()
+    gc.freeze()
@@ -0,0 +1,101 @@
+import threading
+import weakref
+import pandas as pd
+
+MEASURES = ['Yield', 'Production', 'Area']
+STATS = ['mean', 'sum', 'min', 'max', 'count']
+
+# Rollups the dashboard reads: crop trend by year, season comparison by crop,
+# and per-season ranges for normalization
+ROLLUPS = [('Crop', 'Year'), ('Season', 'Crop'), ('Crop', 'Season'), ('Crop',), ('Season',)]
+
+
+class AggregationCube:
+    """Pre-aggregated statistics of the dashboard measures
+
+    The base cube holds mean, sum, min, max and count of every measure per
+    (Crop, Season, Year). Rollups are derived from the base cube rather than
+    the raw frame, so building them costs nothing once the base exists and
+    chart rendering never has to scan the raw rows.
+    """
+
+    def __init__(self, df, measures=None):
+        self.measures = [m for m in (measures or MEASURES) if m in df.columns]
+        self.empty = df.empty
+        self.crops = set(df['Crop'].dropna().unique()) if 'Crop' in df.columns else set()
+        self.seasons = set(df['Season'].dropna().unique()) if 'Season' in df.columns else set()
+
+        self.base = df.groupby(['Crop', 'Season', 'Year'], observed=True)[self.measures].agg(STATS)
+        self.rollups = {levels: self._rollup(levels) for levels in ROLLUPS}
+
+    def _rollup(self, levels):
+        """Combine base statistics over every level not in levels"""
+        def combine(stat, how):
+            frame = self.base.xs(stat, axis=1, level=1)
+            return frame.groupby(level=list(levels), observed=True).agg(how)
+
+        sums = combine('sum', 'sum')
+        counts = combine('count', 'sum')
+        rollup = pd.concat({
+            'mean': sums / counts.where(counts > 0),
+            'sum': sums,
+            'min': combine('min', 'min'),
+            'max': combine('max', 'max'),
+            'count': counts
+        }, axis=1)
+        return rollup.swaplevel(axis=1).sort_index(axis=1)
+
+    def rollup(self, *levels):
+        """Return the precomputed rollup over the given index levels"""
+        return self.rollups[tuple(levels)]
+
+    def _select(self, levels, key, metrics, stat):
+        """Rows of a rollup for one value of its first level, one column per metric"""
+        table = self.rollups[levels]
+        if key not in table.index.get_level_values(0):
+            return pd.DataFrame(columns=[levels[1]] + list(metrics))
+        subset = table.xs(key, level=0)[[(metric, stat) for metric in metrics]]
+        subset.columns = list(metrics)
+        return subset.rename_axis(levels[1]).reset_index()
+
+    def crop_by_year(self, crop, metrics, stat='mean'):
+        """Per-year statistics of a crop across all seasons"""
+        metrics = [metrics] if isinstance(metrics, str) else list(metrics)
+        return self._select(('Crop', 'Year'), crop, metrics, stat)
+
+    def season_by_crop(self, season, metrics, stat='mean'):
+        """Per-crop statistics of a season across all years"""
+        metrics = [metrics] if isinstance(metrics, str) else list(metrics)
+        return self._select(('Season', 'Crop'), season, metrics, stat)
+
+    def season_stat(self, season, metric, stat):
+        """A single statistic of a measure over a whole season"""
+        return self.rollups[('Season',)].loc[season, (metric, stat)]
+
+
+_cubes = {}
+_cubes_lock = threading.Lock()
+
+
+def get_cube(df):
+    """Return the aggregation cube for df, building it on first use
+
+    Cubes are memoized per DataFrame object, so a frame loaded once at
+    startup is aggregated once and every chart render reads the cube.
+    """
+    entry = _cubes.get(id(df))
+    if entry is not None and entry[0]() is df:
+        return entry[1]
+
+    with _cubes_lock:
+        entry = _cubes.get(id(df))
+        if entry is not None and entry[0]() is df:
+            return entry[1]
+
+        # Forget cubes whose frames have been garbage collected
+        for key in [key for key, (ref, _) in _cubes.items() if ref() is None]:
+            del _cubes[key]
+
+        cube = AggregationCube(df)
+        _cubes[id(df)] = (weakref.ref(df), cube)
+        return cube
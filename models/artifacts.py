@@ -0,0 +1,206 @@
+import json
+import logging
+import os
+import pickle
+import shutil
+import time
+import uuid
+from config import Config
+from models.incremental import hash_file
+from models.storage import file_version
+
+# Bundle entries kept in the manifest instead of their own file
+METADATA_KEYS = ['feature_names', 'baseline_year']
+MANIFEST_FILE = 'manifest.json'
+CURRENT_FILE = 'CURRENT'
+FORMAT_VERSION = 1
+
+logger = logging.getLogger(__name__)
+
+
+class ArtifactError(Exception):
+    """Raised when a model artifact directory is missing or corrupt"""
+
+
+def current_pointer(config=None):
+    """Path of the file naming the active artifact version"""
+    config = config or Config()
+    return os.path.join(config.ARTIFACT_DIR, CURRENT_FILE)
+
+
+def current_artifact_dir(config=None):
+    """Directory of the active artifact version, or None if there is none"""
+    config = config or Config()
+    try:
+        with open(current_pointer(config)) as f:
+            version = f.read().strip()
+    except OSError:
+        return None
+    path = os.path.join(config.ARTIFACT_DIR, version)
+    return path if version and os.path.isdir(path) else None
+
+
+def models_available(config=None):
+    """True if saved models exist, as artifacts or as the legacy pickle"""
+    config = config or Config()
+    return current_artifact_dir(config) is not None or os.path.exists(config.MODEL_FILE)
+
+
+def model_version(config=None):
+    """Cheap version stamp of the saved models: the CURRENT pointer's stat and version id
+
+    The pointer always has the same size, so two versions published within
+    one mtime tick are told apart by the version id it names.
+    """
+    config = config or Config()
+    stamp = file_version(current_pointer(config))
+    if stamp is None:
+        return file_version(config.MODEL_FILE)
+    try:
+        with open(current_pointer(config)) as f:
+            return stamp + (f.read().strip(),)
+    except OSError:
+        return file_version(config.MODEL_FILE)
+
+
+def save_artifacts(bundle, config=None):
+    """Write a model bundle as a new artifact version and make it current
+
+    Every component goes to its own uncompressed joblib file, so its numpy
+    arrays can be memory-mapped on load. The manifest records each file's
+    size and SHA-256 plus the small metadata entries. The version is written
+    to a temporary directory, renamed into place and only then published by
+    replacing the CURRENT pointer, so readers never see a partial version.
+    Returns the directory of the new version.
+    """
+    import joblib
+
+    config = config or Config()
+    os.makedirs(config.ARTIFACT_DIR, exist_ok=True)
+
+    # The random suffix keeps versions saved within the same second apart
+    version = time.strftime('%Y%m%dT%H%M%S') + f'-{uuid.uuid4().hex[:12]}'
+    staging = os.path.join(config.ARTIFACT_DIR, f'.tmp-{version}')
+    target = os.path.join(config.ARTIFACT_DIR, version)
+    os.makedirs(staging)
+
+    try:
+        components = {}
+        for name, value in bundle.items():
+            if name in METADATA_KEYS:
+                continue
+            filename = f'{name}.joblib'
+            path = os.path.join(staging, filename)
+            joblib.dump(value, path)
+            components[name] = {
+                'file': filename,
+                'bytes': os.path.getsize(path),
+                'sha256': hash_file(path)
+            }
+
+        manifest = {
+            'format': FORMAT_VERSION,
+            'version': version,
+            'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'components': components,
+            'metadata': {key: bundle[key] for key in METADATA_KEYS if key in bundle}
+        }
+        with open(os.path.join(staging, MANIFEST_FILE), 'w') as f:
+            json.dump(manifest, f, indent=2)
+
+        os.rename(staging, target)
+    finally:
+        # Left behind only if writing or renaming failed
+        shutil.rmtree(staging, ignore_errors=True)
+
+    pointer_tmp = current_pointer(config) + '.tmp'
+    with open(pointer_tmp, 'w') as f:
+        f.write(version)
+    os.replace(pointer_tmp, current_pointer(config))
+
+    prune_artifacts(config)
+    return target
+
+
+def read_manifest(path):
+    """Read the manifest of an artifact directory"""
+    try:
+        with open(os.path.join(path, MANIFEST_FILE)) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError) as e:
+        raise ArtifactError(f"Unreadable manifest in {path}: {e}")
+    if manifest.get('format') != FORMAT_VERSION:
+        raise ArtifactError(f"Unsupported artifact format {manifest.get('format')} in {path}")
+    return manifest
+
+
+def verify_artifacts(path, manifest=None):
+    """Check every component file against the manifest's size and checksum"""
+    manifest = manifest or read_manifest(path)
+    for name, info in manifest['components'].items():
+        file_path = os.path.join(path, info['file'])
+        if not os.path.exists(file_path):
+            raise ArtifactError(f"Missing artifact component: {file_path}")
+        if os.path.getsize(file_path) != info['bytes'] or hash_file(file_path) != info['sha256']:
+            raise ArtifactError(f"Checksum mismatch for artifact component: {name}")
+    return manifest
+
+
+def load_artifacts(path=None, config=None, mmap_mode='r', verify=True):
+    """Load an artifact directory (the current one by default) into a bundle dict
+
+    With mmap_mode='r' numpy arrays are mapped read-only from the files, so
+    processes forked from a parent that loaded them share the pages. Pass
+    mmap_mode=None for a bundle whose models will be modified (e.g. refit).
+    """
+    # Imported here so that reading version stamps stays import-cheap
+    import joblib
+
+    path = path or current_artifact_dir(config)
+    if path is None:
+        raise ArtifactError("No current model artifacts")
+
+    manifest = verify_artifacts(path) if verify else read_manifest(path)
+    bundle = dict(manifest['metadata'])
+    for name, info in manifest['components'].items():
+        bundle[name] = joblib.load(os.path.join(path, info['file']), mmap_mode=mmap_mode)
+    bundle['artifact_version'] = manifest['version']
+    return bundle
+
+
+def load_model_bundle(config=None, mmap_mode='r'):
+    """Load the saved models: current artifacts first, then the legacy pickle
+
+    Returns (bundle, source) where source is the artifact directory or the
+    pickle path; raises FileNotFoundError if neither exists.
+    """
+    config = config or Config()
+    path = current_artifact_dir(config)
+    if path is not None:
+        try:
+            return load_artifacts(path, config, mmap_mode=mmap_mode), path
+        except ArtifactError as e:
+            logger.warning(f"⚠️ {e}; falling back to {config.MODEL_FILE}")
+
+    if not os.path.exists(config.MODEL_FILE):
+        raise FileNotFoundError(config.MODEL_FILE)
+    with open(config.MODEL_FILE, 'rb') as f:
+        return pickle.load(f), config.MODEL_FILE
+
+
+def prune_artifacts(config=None):
+    """Delete the oldest artifact versions beyond Config.ARTIFACT_KEEP
+
+    The current version is never deleted. Processes that still map files of
+    a deleted version keep working; the data is freed once they let go.
+    """
+    config = config or Config()
+    current = current_artifact_dir(config)
+    versions = sorted(
+        entry for entry in os.listdir(config.ARTIFACT_DIR)
+        if os.path.isdir(os.path.join(config.ARTIFACT_DIR, entry)) and not entry.startswith('.')
+    )
+    for version in versions[:-config.ARTIFACT_KEEP or None]:
+        path = os.path.join(config.ARTIFACT_DIR, version)
+        if path != current:
+            shutil.rmtree(path, ignore_errors=True)
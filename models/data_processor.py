@@ -2,7 +2,14 @@ import pandas as pd
 import numpy as np
 from sklearn.preprocessing import LabelEncoder, StandardScaler
 import os
+import pickle
+import tempfile
 from config import Config
+from models.storage import (ProcessedDataWriter, add_derived_columns, compact_frame, read_processed_data,
+                            write_processed_data)
+from models.incremental import YEAR_PATTERN, compute_raw_state, load_raw_state, raw_files, save_raw_state
+
+KEYS = ['Crop', 'Season', 'Year']
 
 class DataProcessor:
     def __init__(self):
@@ -12,25 +19,89 @@ class DataProcessor:
         self.scaler_yield = StandardScaler()
         self.scaler_production = StandardScaler()
         
+    @staticmethod
+    def parse_year_columns(columns):
+        """Map each year column of a wide file to its crop year (e.g. 'Yield-2015-16' -> 2015)"""
+        years = {}
+        for col in columns:
+            if col in ['Crop', 'Season']:
+                continue
+            match = YEAR_PATTERN.search(str(col))
+            if match is None:
+                raise ValueError(f"Unrecognised year column: {col}")
+            years[col] = int(match.group(1))
+        return years
+    
     def melt_dataframe(self, df, value_name):
         """Convert wide format to long format"""
-        year_cols = [col for col in df.columns if col not in ['Crop', 'Season']]
+        years = self.parse_year_columns(df.columns)
         
         melted = pd.melt(df, 
                         id_vars=['Crop', 'Season'], 
-                        value_vars=year_cols,
+                        value_vars=list(years),
                         var_name='Year_Column', 
                         value_name=value_name)
         
-        # Extract year from column name (e.g., 'Yield-2015-16' -> 2015)
-        melted['Year'] = melted['Year_Column'].str.extract(r'(\d{4})-\d{2}').iloc[:, 0].astype(int)
+        # Year headers are parsed once per file, not once per melted row
+        melted['Year'] = melted['Year_Column'].map(years).astype(int)
         melted = melted.drop('Year_Column', axis=1)
         melted[value_name] = pd.to_numeric(melted[value_name], errors='coerce')
         
         return melted
     
-    def load_and_process_data(self):
+    def merge_measures(self, frames):
+        """Melt each wide measure frame and outer-join them on (Crop, Season, Year)"""
+        merged_df = None
+        for measure, df in frames.items():
+            long = self.melt_dataframe(df, measure)
+            merged_df = long if merged_df is None else merged_df.merge(long, on=KEYS, how='outer')
+        return merged_df
+    
+    def align_measures(self, frames):
+        """Align the wide measure frames into one long frame (None if a file has duplicate keys)"""
+        wides = {}
+        for measure, df in frames.items():
+            years = self.parse_year_columns(df.columns)
+            wide = df.dropna(subset=['Crop', 'Season']).set_index(['Crop', 'Season'])[list(years)]
+            wide.columns = list(years.values())
+            if not (wide.index.is_unique and wide.columns.is_unique):
+                return None
+            wides[measure] = wide.apply(pd.to_numeric, errors='coerce')
+        
+        keys = wides[next(iter(wides))].index
+        years = set()
+        for wide in wides.values():
+            keys = keys.union(wide.index)
+            years.update(wide.columns)
+        keys = keys.sort_values()
+        years = sorted(years)
+        
+        # (key, year, measure) cube flattened to one row per (key, year)
+        values = np.stack([wide.reindex(index=keys, columns=years).to_numpy(dtype='float64')
+                           for wide in wides.values()], axis=-1).reshape(-1, len(wides))
+        keep = ~np.isnan(values).all(axis=1)
+        
+        aligned = pd.DataFrame({
+            'Crop': np.repeat(keys.get_level_values('Crop'), len(years))[keep],
+            'Season': np.repeat(keys.get_level_values('Season'), len(years))[keep],
+            'Year': np.tile(np.asarray(years, dtype=int), len(keys))[keep]
+        })
+        for i, measure in enumerate(wides):
+            aligned[measure] = values[keep, i]
+        return aligned
+    
+    def combine_measures(self, frames):
+        """Long (Crop, Season, Year) frame of all measures: aligned, or merged as a fallback"""
+        combined = self.align_measures(frames)
+        if combined is None:
+            print("  - Duplicate rows in the raw data; falling back to outer merges")
+            combined = self.merge_measures(frames)
+        return combined
+    
+    def load_and_process_data(self, streaming=None):
         """Load and process all datasets"""
+        if self.use_streaming(streaming):
+            return self.load_streamed_data()
         try:
             print("📊 Loading datasets...")
             # Load datasets
@@ -42,16 +113,9 @@ class DataProcessor:
             print(f"  - Production data: {production_df.shape}")
             print(f"  - Area data: {area_df.shape}")
             
-            print("🔄 Transforming to long format...")
-            # Transform to long format
-            yield_long = self.melt_dataframe(yield_df, 'Yield')
-            production_long = self.melt_dataframe(production_df, 'Production')
-            area_long = self.melt_dataframe(area_df, 'Area')
-            
-            print("🔗 Merging datasets...")
-            # Merge datasets
-            merged_df = yield_long.merge(production_long, on=['Crop', 'Season', 'Year'], how='outer')
-            merged_df = merged_df.merge(area_long, on=['Crop', 'Season', 'Year'], how='outer')
+            print("🔗 Aligning datasets in long format...")
+            # One alignment of the three wide files instead of melting and merging twice
+            merged_df = self.combine_measures({'Yield': yield_df, 'Production': production_df, 'Area': area_df})
             
             print(f"  - Merged shape: {merged_df.shape}")
             
@@ -65,19 +129,15 @@ class DataProcessor:
             print(f"  - After removing missing Crop/Season/Year: {len(merged_df)}")
             
             print("⚙️ Feature engineering...")
-            # Feature engineering
-            merged_df['Crop_encoded'] = self.le_crop.fit_transform(merged_df['Crop'])
-            merged_df['Season_encoded'] = self.le_season.fit_transform(merged_df['Season'])
+            # Compact schema: categorical Crop/Season, int16 Year, float32 measures
+            merged_df = compact_frame(merged_df)
             
-            # Handle division by zero in productivity calculation
-            merged_df['Productivity'] = np.where(
-                merged_df['Area'] > 0, 
-                merged_df['Production'] / merged_df['Area'], 
-                0
-            )
+            # Categories are sorted, so their codes match the LabelEncoder encodings
+            self.le_crop.fit(merged_df['Crop'].cat.categories)
+            self.le_season.fit(merged_df['Season'].cat.categories)
             
-            # Normalize years from 2015 (baseline year)
-            merged_df['Year_normalized'] = merged_df['Year'] - 2015
+            # Encoded columns, productivity and normalized year (baseline 2015)
+            merged_df = add_derived_columns(merged_df)
             
             print(f"✅ Processing complete! Final shape: {merged_df.shape}")
             print(f"  - Unique crops: {merged_df['Crop'].nunique()}")
@@ -85,11 +145,12 @@ class DataProcessor:
             print(f"  - Year range: {merged_df['Year'].min()}-{merged_df['Year'].max()}")
             
             # Save processed data
-            os.makedirs(self.config.PROCESSED_DATA_DIR, exist_ok=True)
-            processed_path = os.path.join(self.config.PROCESSED_DATA_DIR, self.config.MERGED_FILE)
-            merged_df.to_csv(processed_path, index=False)
+            processed_path = write_processed_data(merged_df, self.config)
             print(f"💾 Processed data saved to: {processed_path}")
             
+            # Remember what the raw inputs looked like for incremental updates
+            save_raw_state(compute_raw_state(load_raw_state(self.config), self.config), self.config)
+            
             return merged_df
             
         except Exception as e:
@@ -98,6 +159,151 @@ class DataProcessor:
             traceback.print_exc()
             return None
     
+    def use_streaming(self, streaming=None):
+        """Resolve the streaming setting against the size of the raw files"""
+        if streaming is not None:
+            return streaming
+        size = sum(os.path.getsize(path) for path in raw_files(self.config).values() if os.path.exists(path))
+        return size > self.config.STREAMING_MIN_RAW_MB * 1024 ** 2
+    
+    def partition_raw_file(self, path, measure, spill_dir, partitions, chunk_rows):
+        """Melt a raw file chunk by chunk into per-partition spill files"""
+        rows = 0
+        handles = {}
+        try:
+            for chunk in pd.read_csv(path, chunksize=chunk_rows, dtype={'Crop': str, 'Season': str}):
+                rows += len(chunk)
+                chunk = chunk.dropna(subset=['Crop', 'Season'])
+                buckets = pd.util.hash_pandas_object(chunk[['Crop', 'Season']], index=False).to_numpy() % partitions
+                for part in np.unique(buckets):
+                    long = self.melt_dataframe(chunk[buckets == part], measure).dropna(subset=[measure])
+                    long = long.astype({'Year': 'int16', measure: 'float32'})
+                    if part not in handles:
+                        handles[part] = open(os.path.join(spill_dir, f'{measure}-{part}.pkl'), 'wb')
+                    pickle.dump(long, handles[part], protocol=pickle.HIGHEST_PROTOCOL)
+        finally:
+            for handle in handles.values():
+                handle.close()
+        return rows
+    
+    @staticmethod
+    def read_partition(spill_dir, measure, part):
+        """Long rows of one measure in one partition (empty frame if none)"""
+        path = os.path.join(spill_dir, f'{measure}-{part}.pkl')
+        frames = []
+        if os.path.exists(path):
+            with open(path, 'rb') as f:
+                while True:
+                    try:
+                        frames.append(pickle.load(f))
+                    except EOFError:
+                        break
+        if not frames:
+            return pd.DataFrame({'Crop': pd.Series(dtype=object), 'Season': pd.Series(dtype=object),
+                                 'Year': pd.Series(dtype='int16'), measure: pd.Series(dtype='float32')})
+        return pd.concat(frames, ignore_index=True)
+    
+    def stream_process_data(self, chunk_rows=None, partitions=None):
+        """Process the raw files chunk by chunk without loading them fully"""
+        chunk_rows = chunk_rows or self.config.STREAMING_CHUNK_ROWS
+        partitions = partitions or self.config.STREAMING_PARTITIONS
+        try:
+            print(f"📊 Streaming datasets ({chunk_rows} rows per chunk, {partitions} partitions)...")
+            crops, seasons = set(), set()
+            years = []
+            os.makedirs(self.config.PROCESSED_DATA_DIR, exist_ok=True)
+            with tempfile.TemporaryDirectory(prefix='spill-', dir=self.config.PROCESSED_DATA_DIR) as spill_dir:
+                files = raw_files(self.config)
+                for measure, path in files.items():
+                    rows = self.partition_raw_file(path, measure, spill_dir, partitions, chunk_rows)
+                    print(f"  - {measure} data: {rows} rows partitioned")
+                
+                print("🔗 Joining partitions...")
+                with ProcessedDataWriter(self.config) as writer:
+                    for part in range(partitions):
+                        merged = None
+                        for measure in files:
+                            long = self.read_partition(spill_dir, measure, part)
+                            merged = long if merged is None else merged.merge(long, on=KEYS, how='outer')
+                        merged = merged.dropna(subset=list(files), how='all').sort_values(KEYS)
+                        if len(merged):
+                            crops.update(merged['Crop'].unique())
+                            seasons.update(merged['Season'].unique())
+                            years.extend([merged['Year'].min(), merged['Year'].max()])
+                        writer.append(merged)
+            
+            # Categories are sorted, so these match the encodings of the stored data
+            self.le_crop.fit(sorted(crops))
+            self.le_season.fit(sorted(seasons))
+            
+            print(f"✅ Processing complete! Rows written: {writer.rows}")
+            print(f"  - Unique crops: {len(crops)}")
+            print(f"  - Unique seasons: {len(seasons)}")
+            if years:
+                print(f"  - Year range: {min(years)}-{max(years)}")
+            print(f"💾 Processed data saved to: {writer.path}")
+            
+            save_raw_state(compute_raw_state(load_raw_state(self.config), self.config), self.config)
+            return writer.path
+        
+        except Exception as e:
+            print(f"❌ Error in streaming data processing: {e}")
+            import traceback
+            traceback.print_exc()
+            return None
+    
+    def load_streamed_data(self):
+        """Stream-process the raw files, then load the compact result for modeling"""
+        path = self.stream_process_data()
+        if path is None:
+            return None
+        merged_df = read_processed_data(path)
+        self.le_crop.fit(merged_df['Crop'].cat.categories)
+        self.le_season.fit(merged_df['Season'].cat.categories)
+        return add_derived_columns(merged_df)
+    
+    def update_processed_data(self, years):
+        """Reprocess only the given years and splice them into the processed data"""
+        try:
+            existing = read_processed_data(config=self.config)
+            if existing is None:
+                return None
+            
+            years = set(years)
+            print(f"📊 Reprocessing years {sorted(years)}...")
+            slices = {}
+            for measure, path in raw_files(self.config).items():
+                header = pd.read_csv(path, nrows=0).columns
+                year_cols = [col for col in header
+                             if YEAR_PATTERN.search(col) and int(YEAR_PATTERN.search(col).group(1)) in years]
+                slices[measure] = pd.read_csv(path, usecols=['Crop', 'Season'] + year_cols)
+            
+            update = self.combine_measures(slices)
+            update = update.dropna(subset=['Yield', 'Production', 'Area'], how='all')
+            update = update.dropna(subset=['Crop', 'Season', 'Year'])
+            
+            kept = existing[~existing['Year'].isin(years)].astype({'Crop': str, 'Season': str})
+            merged_df = pd.concat([kept, update], ignore_index=True)
+            merged_df = merged_df.sort_values(['Crop', 'Season', 'Year'], kind='stable')
+            merged_df = compact_frame(merged_df)
+            
+            print(f"  - Replaced {len(existing) - len(kept)} rows with {len(update)} new rows; "
+                  f"final shape: {merged_df.shape}")
+            
+            self.le_crop.fit(merged_df['Crop'].cat.categories)
+            self.le_season.fit(merged_df['Season'].cat.categories)
+            merged_df = add_derived_columns(merged_df)
+            
+            processed_path = write_processed_data(merged_df, self.config)
+            print(f"💾 Processed data saved to: {processed_path}")
+            return merged_df
+        
+        except Exception as e:
+            print(f"❌ Error in incremental processing: {e}")
+            import traceback
+            traceback.print_exc()
+            return None
+    
     def prepare_features(self, df):
         """Prepare features for modeling"""
         print("🎯 Preparing features for modeling...")
@@ -0,0 +1,115 @@
+import logging
+import threading
+from config import Config
+from models.storage import compact_frame, file_version, find_processed_data, read_processed_data
+
+logger = logging.getLogger(__name__)
+
+
+class DataStore:
+    """Process-wide holder of the processed dataset
+
+    The dataset is parsed once per process and the same frame is handed to
+    every consumer (the predictor's trend index and the dashboard charts).
+    Consumers must treat it as read-only; derive new frames instead of
+    modifying it in place.
+    """
+
+    def __init__(self, config=None):
+        self.config = config or Config()
+        self.path = None
+        self.version = None
+        self._frame = None
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    @property
+    def frame(self):
+        """The shared processed frame, loaded on first access (None if missing)"""
+        if not self._loaded:
+            self.load()
+        return self._frame
+
+    def load(self, frame=None):
+        """Load the processed data from disk, or adopt a frame that was just built
+
+        Passing frame lets a process that has just run the processing
+        pipeline share its result instead of parsing the file it wrote.
+        """
+        with self._lock:
+            path = find_processed_data(self.config)
+            try:
+                if frame is not None:
+                    self._frame = compact_frame(frame)
+                elif path is not None:
+                    self._frame = read_processed_data(path)
+                else:
+                    self._frame = None
+            except Exception as e:
+                logger.error(f"❌ Error loading processed data: {e}")
+                self._frame = None
+
+            self.path = path
+            self.version = self._version_token(path)
+            self._loaded = True
+
+            if self._frame is not None:
+                logger.info(f"✅ Processed data loaded: {len(self._frame)} rows, "
+                            f"{self.memory_usage() / 1024 ** 2:.2f} MB")
+            return self._frame
+
+    def reload(self):
+        """Force a reload from disk"""
+        return self.load()
+
+    def refresh_if_changed(self):
+        """Reload if the processed file changed on disk; returns True if reloaded
+
+        Only an os.stat() is done when nothing changed, so this is cheap enough
+        to call on every dashboard refresh tick.
+        """
+        path = find_processed_data(self.config)
+        version = self._version_token(path)
+        if version is None or version == self.version:
+            return False
+        self.load()
+        return True
+
+    def memory_usage(self):
+        """Deep memory footprint of the shared frame in bytes"""
+        if self._frame is None:
+            return 0
+        return int(self._frame.memory_usage(deep=True).sum())
+
+    def report(self):
+        """Summary of what the store holds and how much memory it uses"""
+        frame = self._frame
+        return {
+            'path': self.path,
+            'version': self.version,
+            'rows': 0 if frame is None else len(frame),
+            'columns': [] if frame is None else list(frame.columns),
+            'memory_bytes': self.memory_usage()
+        }
+
+    @staticmethod
+    def _version_token(path):
+        """JSON-friendly version stamp of the processed file"""
+        version = file_version(path) if path else None
+        if version is None:
+            return None
+        return '-'.join(str(part) for part in version)
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_data_store():
+    """Return the process-wide DataStore"""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = DataStore()
+    return _store
@@ -0,0 +1,181 @@
+import hashlib
+import json
+import os
+import re
+import pandas as pd
+from config import Config
+
+YEAR_PATTERN = re.compile(r'(\d{4})-\d{2}')
+
+
+def raw_files(config=None):
+    """Map measure name -> raw wide-format file path"""
+    config = config or Config()
+    return {
+        'Yield': os.path.join(config.RAW_DATA_DIR, config.YIELD_FILE),
+        'Production': os.path.join(config.RAW_DATA_DIR, config.PRODUCTION_FILE),
+        'Area': os.path.join(config.RAW_DATA_DIR, config.AREA_FILE)
+    }
+
+
+def hash_file(path, chunk_size=1 << 20):
+    """SHA-256 of a file's bytes"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def hash_values(values, digest=None):
+    """Stable hash of a sequence of raw string cell values
+
+    Pass the same digest to successive calls to hash values chunk by chunk.
+    """
+    digest = digest or hashlib.sha1()
+    for value in values:
+        digest.update(str(value).encode('utf-8') + b'\x1e')
+    return digest.hexdigest()
+
+
+def describe_raw_file(path, known=None, chunk_rows=None):
+    """Hash a raw file as a whole, its Crop/Season keys and every year column
+
+    If known (a previous description) has the same file hash, it is reused
+    without parsing the file. The file is read chunk_rows rows at a time
+    (default Config.STREAMING_CHUNK_ROWS), so large files are never fully
+    loaded.
+    """
+    file_hash = hash_file(path)
+    if known and known.get('sha256') == file_hash:
+        return known
+
+    keys = hashlib.sha1()
+    digests = {}
+    for df in pd.read_csv(path, dtype=str, keep_default_na=False,
+                          chunksize=chunk_rows or Config.STREAMING_CHUNK_ROWS):
+        hash_values(df['Crop'] + '|' + df['Season'], keys)
+        for col in df.columns:
+            if YEAR_PATTERN.search(col):
+                hash_values(df[col], digests.setdefault(col, hashlib.sha1()))
+
+    return {
+        'sha256': file_hash,
+        'keys': keys.hexdigest(),
+        'columns': {
+            col: {'year': int(YEAR_PATTERN.search(col).group(1)), 'hash': digest.hexdigest()}
+            for col, digest in digests.items()
+        }
+    }
+
+
+def state_path(config=None):
+    config = config or Config()
+    return os.path.join(config.PROCESSED_DATA_DIR, config.PROCESSING_STATE_FILE)
+
+
+def load_raw_state(config=None):
+    """Load the raw-data description saved by the last processing run"""
+    try:
+        with open(state_path(config)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def compute_raw_state(previous=None, config=None):
+    """Describe every raw file, reusing unchanged descriptions from previous"""
+    previous = previous or {}
+    return {
+        measure: describe_raw_file(path, previous.get(measure))
+        for measure, path in raw_files(config).items()
+    }
+
+
+def save_raw_state(state, config=None):
+    """Persist the raw-data description next to the processed data"""
+    config = config or Config()
+    os.makedirs(config.PROCESSED_DATA_DIR, exist_ok=True)
+    with open(state_path(config), 'w') as f:
+        json.dump(state, f, indent=2)
+
+
+def detect_changes(previous, current):
+    """Compare two raw-data descriptions
+
+    Returns {'full': bool, 'years': sorted list of changed years}. A full
+    rebuild is needed when there is no previous state, a file's Crop/Season
+    rows changed, or a year column disappeared; otherwise only the years
+    whose columns were added or modified need reprocessing.
+    """
+    if not previous or set(previous) != set(current):
+        return {'full': True, 'years': []}
+
+    years = set()
+    for measure, description in current.items():
+        before = previous[measure]
+        if description['sha256'] == before['sha256']:
+            continue
+        if description['keys'] != before['keys'] or set(before['columns']) - set(description['columns']):
+            return {'full': True, 'years': []}
+        for col, info in description['columns'].items():
+            if before['columns'].get(col, {}).get('hash') != info['hash']:
+                years.add(info['year'])
+
+    return {'full': False, 'years': sorted(years)}
+
+
+def run_incremental_update(config=None):
+    """Bring processed data and models up to date with the raw files
+
+    Returns 'unchanged' if nothing changed, 'updated' if only the changed
+    years were reprocessed and the models were warm-started, or 'full' if a
+    full rebuild is required (the caller should run the normal pipeline).
+    """
+    from models.artifacts import load_model_bundle, models_available
+    from models.data_processor import DataProcessor
+    from models.model_trainer import ModelTrainer
+
+    config = config or Config()
+    previous = load_raw_state(config)
+    current = compute_raw_state(previous, config)
+    changes = detect_changes(previous, current)
+
+    if changes['full']:
+        print("🔁 Raw data layout changed (or no previous state); full rebuild required.")
+        return 'full'
+    if not changes['years']:
+        print("✅ Raw data unchanged; nothing to do.")
+        return 'unchanged'
+    if not models_available(config):
+        return 'full'
+
+    print(f"🧩 Changed years: {changes['years']}")
+    processor = DataProcessor()
+    merged_df = processor.update_processed_data(changes['years'])
+    if merged_df is None:
+        return 'full'
+
+    # Load writable copies; the warm-started models are modified in place
+    bundle, _ = load_model_bundle(config, mmap_mode=None)
+
+    # New crops or seasons change the encodings, which needs a full retrain
+    if (list(bundle['crop_encoder'].classes_) != list(merged_df['Crop'].cat.categories) or
+            list(bundle['season_encoder'].classes_) != list(merged_df['Season'].cat.categories)):
+        print("🔁 Crop/season categories changed; full retrain required.")
+        return 'full'
+
+    processor.le_crop = bundle['crop_encoder']
+    processor.le_season = bundle['season_encoder']
+    X_yield, y_yield, X_production, y_production = processor.prepare_features(merged_df)
+
+    trainer = ModelTrainer(processor)
+    if not trainer.update_models(bundle, X_yield, y_yield, X_production, y_production):
+        return 'full'
+    if trainer.save_models() is None:
+        # Recording the new raw state now would mark this data as already trained on
+        print("❌ Saving the updated models failed; full rebuild required.")
+        return 'full'
+
+    save_raw_state(current, config)
+    return 'updated'
@@ -0,0 +1,152 @@
+import hashlib
+import json
+import os
+import time
+from config import Config
+from models.incremental import hash_file, raw_files, run_incremental_update
+from models.storage import find_processed_data
+
+# Modules whose code determines the processed data and the trained models (every
+# models/ module the processing, training, incremental update and artifact paths import)
+PIPELINE_MODULES = [
+    'data_processor.py', 'storage.py', 'incremental.py', 'model_trainer.py', 'tuning.py', 'tree_engine.py',
+    'artifacts.py'
+]
+
+# Config settings that change the pipeline output (paths and serving settings do not)
+PIPELINE_SETTINGS = [
+    'YIELD_FILE', 'PRODUCTION_FILE', 'AREA_FILE', 'PROCESSED_FORMAT', 'COMPILED_TREES',
+    'SEARCH_STRATEGY', 'SEARCH_CANDIDATES', 'SEARCH_CV', 'SEARCH_CV_SPLITS', 'SEARCH_TIME_BUDGET'
+]
+HISTORY_SIZE = 20
+
+
+def lineage_path(config=None):
+    config = config or Config()
+    return os.path.join(config.MODEL_DIR, config.LINEAGE_FILE)
+
+
+def code_version():
+    """SHA-256 over the source of the processing and training modules"""
+    digest = hashlib.sha256()
+    directory = os.path.dirname(os.path.abspath(__file__))
+    for name in PIPELINE_MODULES:
+        digest.update(name.encode('utf-8') + b'\x1e' + hash_file(os.path.join(directory, name)).encode('ascii'))
+    return digest.hexdigest()
+
+
+def compute_fingerprint(config=None):
+    """Fingerprint of everything the processed data and models are built from
+
+    Combines the SHA-256 of each raw file, the pipeline code version and
+    the output-relevant Config settings. Returns a dict with the parts and
+    their combined 'fingerprint'.
+    """
+    config = config or Config()
+    parts = {
+        'inputs': {measure: hash_file(path) for measure, path in raw_files(config).items()},
+        'code': code_version(),
+        'config': {key: getattr(config, key, None) for key in PIPELINE_SETTINGS}
+    }
+    parts['fingerprint'] = hashlib.sha256(json.dumps(parts, sort_keys=True).encode('utf-8')).hexdigest()
+    return parts
+
+
+def load_lineage(config=None):
+    """The lineage manifest ({'current': entry, 'history': [...]}), or None"""
+    try:
+        with open(lineage_path(config)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def is_up_to_date(fingerprint, config=None, options=None):
+    """True if the current outputs were built from this fingerprint and are intact
+
+    The recorded processed file must still have its recorded checksum and
+    the recorded artifact version must still be the current one. With
+    options (e.g. {'search': True}), the last build must have used them.
+    """
+    from models.artifacts import current_artifact_dir
+
+    config = config or Config()
+    lineage = load_lineage(config)
+    current = (lineage or {}).get('current')
+    if not current or current.get('fingerprint') != fingerprint['fingerprint']:
+        return False
+    if options is not None and current.get('options') != options:
+        return False
+
+    processed = current.get('processed') or {}
+    path = find_processed_data(config)
+    if path is None or os.path.basename(path) != processed.get('file') or hash_file(path) != processed.get('sha256'):
+        return False
+
+    artifact_dir = current_artifact_dir(config)
+    return artifact_dir is not None and os.path.basename(artifact_dir) == current.get('artifact')
+
+
+def changed_parts(fingerprint, config=None):
+    """Names of the fingerprint parts ('inputs', 'code', 'config') that differ from the last build"""
+    current = (load_lineage(config) or {}).get('current')
+    if not current:
+        return ['inputs', 'code', 'config']
+    return [part for part in ('inputs', 'code', 'config') if current.get(part) != fingerprint[part]]
+
+
+def record_lineage(fingerprint, config=None, options=None, mode='full'):
+    """Record input hashes -> processed file -> model artifact for the build just made
+
+    options defaults to those of the previous build (an incremental update
+    keeps the models' hyperparameters). Returns the new entry, or None if
+    there is no processed data or no current artifact to record.
+    """
+    from models.artifacts import current_artifact_dir
+
+    config = config or Config()
+    path = find_processed_data(config)
+    artifact_dir = current_artifact_dir(config)
+    if path is None or artifact_dir is None:
+        return None
+
+    lineage = load_lineage(config) or {}
+    previous = lineage.get('current')
+    entry = dict(fingerprint)
+    entry.update({
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'mode': mode,
+        'options': (previous or {}).get('options', {}) if options is None else options,
+        'processed': {'file': os.path.basename(path), 'sha256': hash_file(path)},
+        'artifact': os.path.basename(artifact_dir)
+    })
+
+    history = ([previous] if previous else []) + lineage.get('history', [])
+    lineage = {'current': entry, 'history': history[:HISTORY_SIZE]}
+
+    os.makedirs(config.MODEL_DIR, exist_ok=True)
+    tmp = lineage_path(config) + '.tmp'
+    with open(tmp, 'w') as f:
+        json.dump(lineage, f, indent=2)
+    os.replace(tmp, lineage_path(config))
+    return entry
+
+
+def update_and_record(fingerprint, config=None):
+    """Run the incremental update and record lineage only for outputs it really saved
+
+    Returns the update status. An 'updated' run that did not publish a new
+    artifact version is reported as 'full' and nothing is recorded, so a
+    failed save is never mistaken for an up-to-date build.
+    """
+    from models.artifacts import current_artifact_dir
+
+    config = config or Config()
+    before = current_artifact_dir(config)
+    status = run_incremental_update(config)
+    if status == 'updated' and current_artifact_dir(config) in (None, before):
+        print("❌ The incremental update did not publish new models; full rebuild required.")
+        status = 'full'
+    if status != 'full':
+        record_lineage(fingerprint, config, mode='incremental')
+    return status
@@ -0,0 +1,154 @@
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+import numpy as np
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+class Summary:
+    """Count, sum and recent-sample quantiles of one timed series
+
+    Quantiles are computed over a sliding window of the most recent
+    observations, so they follow the current latency rather than the whole
+    process lifetime; count and sum are cumulative.
+    """
+
+    def __init__(self, window=2048):
+        self.samples = deque(maxlen=window)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, value):
+        self.samples.append(value)
+        self.count += 1
+        self.total += value
+
+    def quantiles(self, quantiles=QUANTILES):
+        if not self.samples:
+            return {q: float('nan') for q in quantiles}
+        values = np.quantile(np.fromiter(self.samples, dtype=float), quantiles)
+        return dict(zip(quantiles, values.tolist()))
+
+
+class MetricsRegistry:
+    """Thread-safe timing summaries, counters and gauges
+
+    Series are identified by a metric name plus a label dict. render()
+    produces the Prometheus text exposition format.
+    """
+
+    def __init__(self, window=2048):
+        self.window = window
+        self.summaries = {}
+        self.counters = {}
+        self.gauges = {}
+        self.help = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(name, labels):
+        return name, tuple(sorted(labels.items()))
+
+    def describe(self, name, text):
+        """Set the HELP text of a metric"""
+        self.help[name] = text
+
+    def observe(self, name, value, **labels):
+        """Record one observation (e.g. seconds) in a summary"""
+        key = self._key(name, labels)
+        with self._lock:
+            summary = self.summaries.get(key)
+            if summary is None:
+                summary = self.summaries[key] = Summary(self.window)
+            summary.observe(value)
+
+    def observe_stages(self, name, stages, **labels):
+        """Record several (stage, seconds) pairs under one lock acquisition"""
+        with self._lock:
+            for stage, value in stages:
+                key = self._key(name, dict(labels, stage=stage))
+                summary = self.summaries.get(key)
+                if summary is None:
+                    summary = self.summaries[key] = Summary(self.window)
+                summary.observe(value)
+
+    def inc(self, name, amount=1, **labels):
+        """Increase a counter"""
+        key = self._key(name, labels)
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + amount
+
+    def set_gauge(self, name, value, **labels):
+        """Set a gauge to the current value"""
+        with self._lock:
+            self.gauges[self._key(name, labels)] = value
+
+    @contextmanager
+    def timer(self, name, **labels):
+        """Observe the wall-clock duration of the enclosed block"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def render(self):
+        """All series in the Prometheus text exposition format"""
+        with self._lock:
+            summaries = {key: (s.quantiles(), s.count, s.total) for key, s in self.summaries.items()}
+            counters = dict(self.counters)
+            gauges = dict(self.gauges)
+
+        lines = []
+        for kind, series in (('summary', summaries), ('counter', counters), ('gauge', gauges)):
+            names = sorted({name for name, _ in series})
+            for name in names:
+                if name in self.help:
+                    lines.append(f'# HELP {name} {self.help[name]}')
+                lines.append(f'# TYPE {name} {kind}')
+                for (series_name, labels), value in sorted(series.items()):
+                    if series_name != name:
+                        continue
+                    if kind == 'summary':
+                        quantiles, count, total = value
+                        for q, v in quantiles.items():
+                            lines.append(f'{name}{_labels(labels + (("quantile", q),))} {_value(v)}')
+                        lines.append(f'{name}_sum{_labels(labels)} {_value(total)}')
+                        lines.append(f'{name}_count{_labels(labels)} {count}')
+                    else:
+                        lines.append(f'{name}{_labels(labels)} {_value(value)}')
+        return '\n'.join(lines) + '\n'
+
+
+def _value(value):
+    """Format a sample value (NaN and infinities as Prometheus spells them)"""
+    value = float(value)
+    if np.isnan(value):
+        return 'NaN'
+    if np.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+    return repr(value)
+
+
+def _labels(labels):
+    """Format label pairs as {a="1",b="2"} (empty string if there are none)"""
+    if not labels:
+        return ''
+    escaped = (str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, v in labels)
+    return '{' + ','.join(f'{k}="{v}"' for (k, _), v in zip(labels, escaped)) + '}'
+
+
+_registry = MetricsRegistry()
+_registry.describe('predictor_stage_seconds', 'Time spent in each prediction stage')
+_registry.describe('predictor_requests_total', 'Predictions served, by method and outcome')
+_registry.describe('predictor_rows_total', 'Rows predicted, by method')
+_registry.describe('predictor_model_reloads_total', 'New model versions swapped in, rejected or failed to load')
+_registry.describe('dashboard_callback_seconds', 'Dash callback execution time')
+_registry.describe('dashboard_callback_errors_total', 'Dash callbacks that raised')
+
+
+def get_metrics():
+    """Return the process-wide metrics registry"""
+    return _registry
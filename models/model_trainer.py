@@ -4,9 +4,54 @@ from sklearn.linear_model import LinearRegression
 from sklearn.metrics import mean_squared_error, r2_score, mean_absolute_error
 from sklearn.preprocessing import StandardScaler
 import numpy as np
-import pickle
 import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from config import Config
+from models.artifacts import save_artifacts, verify_artifacts
+from models.tree_engine import compile_model
+
+MODEL_NAMES = ['Linear Regression', 'Random Forest', 'Gradient Boosting']
+
+
+def build_model(name, n_jobs=None, params=None):
+    """Create a fresh, unfitted model, with params overriding the defaults"""
+    if name == 'Linear Regression':
+        model = LinearRegression()
+    elif name == 'Random Forest':
+        model = RandomForestRegressor(n_estimators=100, random_state=42, n_jobs=n_jobs)
+    else:
+        model = GradientBoostingRegressor(n_estimators=100, random_state=42)
+    if params:
+        model.set_params(**params)
+    return model
+
+
+def fit_and_evaluate(target, name, X_train, y_train, X_test, y_test, n_jobs=None, params=None):
+    """Fit one (target, algorithm) job and score it on the test split"""
+    model = build_model(name, n_jobs=n_jobs, params=params)
+    model.fit(X_train, y_train)
+    if name == 'Random Forest':
+        # Threads only pay off while fitting; single-row inference runs faster without them
+        model.set_params(n_jobs=None)
+    y_pred_test = model.predict(X_test)
+
+    return target, name, {
+        'model': model,
+        'test_r2': r2_score(y_test, y_pred_test),
+        'test_rmse': np.sqrt(mean_squared_error(y_test, y_pred_test)),
+        'test_mae': mean_absolute_error(y_test, y_pred_test)
+    }
+
+
+def resolve_worker_budget(n_jobs):
+    """Turn an n_jobs setting (None, -1 or a positive count) into a worker count"""
+    cpu_count = os.cpu_count() or 1
+    if n_jobs is None:
+        return 1
+    if n_jobs < 0:
+        return max(1, cpu_count + 1 + n_jobs)
+    return max(1, n_jobs)
+
 
 class ModelTrainer:
     def __init__(self, data_processor):
@@ -14,8 +59,10 @@ class ModelTrainer:
         self.config = Config()
         self.models = {}
         self.scalers = {}
+        self.best_params = {}
+        self.search_results = {}
         
-    def train_models(self, X_yield, y_yield, X_production, y_production):
+    def train_models(self, X_yield, y_yield, X_production, y_production, n_jobs=None, search=None):
         """Train models for both yield and production prediction"""
         
         print(f"Training with {len(X_yield)} yield samples and {len(X_production)} production samples...")
@@ -36,54 +83,58 @@ class ModelTrainer:
             X_production_scaled, y_production, test_size=0.2, random_state=42
         )
         
-        # Initialize models
-        model_types = {
-            'Linear Regression': LinearRegression(),
-            'Random Forest': RandomForestRegressor(n_estimators=100, random_state=42),
-            'Gradient Boosting': GradientBoostingRegressor(n_estimators=100, random_state=42)
+        splits = {
+            'yield': (X_train_y, y_train_y, X_test_y, y_test_y),
+            'production': (X_train_p, y_train_p, X_test_p, y_test_p)
         }
+        jobs = [(target, name) for target in splits for name in MODEL_NAMES]
         
-        # Train yield models
-        print("Training Yield Models...")
-        yield_results = {}
-        for name, model in model_types.items():
-            print(f"  - Training {name}...")
-            model.fit(X_train_y, y_train_y)
-            y_pred_test = model.predict(X_test_y)
-            
-            r2_score_val = r2_score(y_test_y, y_pred_test)
-            yield_results[name] = {
-                'model': model,
-                'test_r2': r2_score_val,
-                'test_rmse': np.sqrt(mean_squared_error(y_test_y, y_pred_test)),
-                'test_mae': mean_absolute_error(y_test_y, y_pred_test)
-            }
-            print(f"    R² Score: {r2_score_val:.4f}")
-        
-        # Train production models
-        print("Training Production Models...")
-        production_results = {}
-        for name, model in model_types.items():
-            print(f"  - Training {name}...")
-            # Create fresh model instance
-            if name == 'Linear Regression':
-                model_copy = LinearRegression()
-            elif name == 'Random Forest':
-                model_copy = RandomForestRegressor(n_estimators=100, random_state=42)
-            else:
-                model_copy = GradientBoostingRegressor(n_estimators=100, random_state=42)
-                
-            model_copy.fit(X_train_p, y_train_p)
-            y_pred_test = model_copy.predict(X_test_p)
-            
-            r2_score_val = r2_score(y_test_p, y_pred_test)
-            production_results[name] = {
-                'model': model_copy,
-                'test_r2': r2_score_val,
-                'test_rmse': np.sqrt(mean_squared_error(y_test_p, y_pred_test)),
-                'test_mae': mean_absolute_error(y_test_p, y_pred_test)
-            }
-            print(f"    R² Score: {r2_score_val:.4f}")
+        self.best_params = {target: {} for target in splits}
+        self.search_results = {target: {} for target in splits}
+        if search is not None:
+            print("Searching hyperparameters...")
+            for target, name in jobs:
+                X_train, y_train = splits[target][0], splits[target][1]
+                # Year_normalized is the last feature; time-series CV orders folds by it
+                result = search.search(name, X_train, y_train, order=X_train[:, -1])
+                self.search_results[target][name] = result
+                self.best_params[target][name] = result['best_params']
+                score = result['best_score']
+                print(f"  - {target.title()} / {name}: "
+                      f"{'n/a' if score is None else f'CV R² {score:.4f}'} "
+                      f"with {result['best_params']} ({len(result['trials'])} trials)")
+        
+        budget = resolve_worker_budget(self.config.TRAINING_N_JOBS if n_jobs is None else n_jobs)
+        processes = min(budget, len(jobs))
+        threads_per_job = max(1, budget // processes)
+        
+        results = {'yield': {}, 'production': {}}
+        if processes > 1:
+            print(f"Training {len(jobs)} models in parallel ({processes} processes, "
+                  f"{threads_per_job} thread(s) per Random Forest)...")
+            with ProcessPoolExecutor(max_workers=processes) as executor:
+                futures = [
+                    executor.submit(fit_and_evaluate, target, name, *splits[target], threads_per_job,
+                                    self.best_params[target].get(name))
+                    for target, name in jobs
+                ]
+                for future in as_completed(futures):
+                    target, name, result = future.result()
+                    results[target][name] = result
+                    print(f"  - {target.title()} / {name}: R² Score: {result['test_r2']:.4f}")
+        else:
+            for target, name in jobs:
+                if name == MODEL_NAMES[0]:
+                    print(f"Training {target.title()} Models...")
+                print(f"  - Training {name}...")
+                _, _, result = fit_and_evaluate(target, name, *splits[target], threads_per_job,
+                                                self.best_params[target].get(name))
+                results[target][name] = result
+                print(f"    R² Score: {result['test_r2']:.4f}")
+        
+        # Keep the usual algorithm order regardless of completion order
+        yield_results = {name: results['yield'][name] for name in MODEL_NAMES}
+        production_results = {name: results['production'][name] for name in MODEL_NAMES}
         
         # Select best models
         best_yield_model = max(yield_results.keys(), key=lambda x: yield_results[x]['test_r2'])
@@ -98,8 +149,36 @@ class ModelTrainer:
         
         return yield_results, production_results
     
+    def update_models(self, saved, X_yield, y_yield, X_production, y_production):
+        """Warm-start saved models on updated data; False if a full retrain is due"""
+        self.scalers = {'yield': saved['yield_scaler'], 'production': saved['production_scaler']}
+        updated = {}
+        
+        print("Updating models incrementally...")
+        for target, X, y in [('yield', X_yield, y_yield), ('production', X_production, y_production)]:
+            model = saved[f'{target}_model']
+            X_scaled = self.scalers[target].transform(X)
+            
+            if isinstance(model, (RandomForestRegressor, GradientBoostingRegressor)):
+                total = model.n_estimators + self.config.INCREMENTAL_ESTIMATORS
+                if total > self.config.INCREMENTAL_MAX_ESTIMATORS:
+                    print(f"  - {target.title()} model would reach {total} estimators; full retrain needed")
+                    return False
+                model.set_params(warm_start=True, n_estimators=total)
+                model.fit(X_scaled, y)
+                model.set_params(warm_start=False)
+            else:
+                model.fit(X_scaled, y)
+            
+            updated[target] = model
+            print(f"  - {target.title()}: {type(model).__name__} "
+                  f"(R² on current data = {r2_score(y, model.predict(X_scaled)):.4f})")
+        
+        self.models.update(updated)
+        return True
+    
     def save_models(self):
-        """Save trained models and preprocessors"""
+        """Save trained models and preprocessors; returns the artifact directory (None on failure)"""
         try:
             # Ensure directory exists
             os.makedirs(self.config.MODEL_DIR, exist_ok=True)
@@ -118,18 +197,23 @@ class ModelTrainer:
                 'baseline_year': baseline_year
             }
             
-            # Save to pickle file
-            with open(self.config.MODEL_FILE, 'wb') as f:
-                pickle.dump(models_to_save, f, protocol=pickle.HIGHEST_PROTOCOL)
+            # Flat tree tables for the compiled inference path (memory-mappable)
+            for target in ['yield', 'production']:
+                engine = compile_model(self.models[target])
+                if engine is not None:
+                    models_to_save[f'{target}_engine'] = engine.to_dict()
             
-            print(f"✅ Models saved successfully to {self.config.MODEL_FILE}")
+            # Save as a new artifact version (one file per component)
+            artifact_dir = save_artifacts(models_to_save, self.config)
+            print(f"✅ Models saved successfully to {artifact_dir}")
             
-            # Verify the save worked
-            with open(self.config.MODEL_FILE, 'rb') as f:
-                test_load = pickle.load(f)
+            # Verify the save worked against the manifest checksums
+            verify_artifacts(artifact_dir)
             print("✅ Model save verification successful!")
+            return artifact_dir
             
         except Exception as e:
             print(f"❌ Error saving models: {e}")
             import traceback
-            traceback.print_exc()
\ No newline at end of file
+            traceback.print_exc()
+            return None
\ No newline at end of file
@@ -0,0 +1,109 @@
+import logging
+import threading
+import time
+from collections import deque
+from config import Config
+from models.artifacts import model_version
+from models.metrics import get_metrics
+
+logger = logging.getLogger(__name__)
+
+# Recent swaps and rejections kept for /model-status
+HISTORY_SIZE = 20
+
+
+class ModelWatcher:
+    """Hot-swap a predictor's models when a new artifact version is published
+
+    A daemon thread polls model_version (a stat and read of the CURRENT pointer)
+    every interval seconds. A new version is loaded in that thread, off the
+    request path, checked with ModelState.smoke_test and only then
+    published with CropPredictor.swap_state, a single reference assignment:
+    predictions already running finish on the state they started with and
+    later ones use the new one. A version that fails to load or validate is
+    not retried until the pointer changes again; the predictor keeps
+    serving the previous models.
+
+    get_predictor is a callable returning the predictor to update, so the
+    watcher can be started before a lazily built predictor exists.
+    """
+
+    def __init__(self, get_predictor, interval=None, config=None, metrics=None):
+        self.config = config or Config()
+        self.get_predictor = get_predictor
+        self.interval = self.config.MODEL_WATCH_INTERVAL if interval is None else interval
+        self.metrics = metrics or get_metrics()
+        self.last_seen = None
+        self.last_error = None
+        self.swaps = 0
+        self.history = deque(maxlen=HISTORY_SIZE)
+        self._stop = threading.Event()
+        self._thread = None
+
+    def check(self):
+        """Swap in the saved models if their version changed; returns True if swapped"""
+        version = model_version(self.config)
+        predictor = self.get_predictor()
+        if version is None or version == self.last_seen or version == predictor.model_version:
+            self.last_seen = version
+            return False
+        self.last_seen = version
+
+        logger.info("🔎 New model version detected; loading it in the background")
+        state = predictor.load_state()
+        if state is None:
+            return self._reject('failed', "new models could not be loaded")
+        error = state.smoke_test()
+        if error:
+            return self._reject('rejected', error)
+
+        predictor.swap_state(state)
+        self.swaps += 1
+        self.last_error = None
+        self._record('swapped', state.version, artifact_version=state.models.get('artifact_version'))
+        self.metrics.inc('predictor_model_reloads_total', outcome='swapped')
+        logger.info(f"🔄 Now serving models from {state.source}")
+        return True
+
+    def _record(self, outcome, version, **details):
+        self.history.append(dict(time=time.time(), outcome=outcome, version=version, **details))
+
+    def _reject(self, outcome, reason):
+        self.last_error = reason
+        self._record(outcome, self.last_seen, reason=reason)
+        self.metrics.inc('predictor_model_reloads_total', outcome=outcome)
+        logger.error(f"❌ Keeping the current models: {reason}")
+        return False
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.check()
+            except Exception as e:
+                self._reject('failed', str(e))
+
+    def start(self):
+        """Start polling in a daemon thread (no-op if running or the interval is 0)"""
+        if self.interval and (self._thread is None or not self._thread.is_alive()):
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='model-watcher', daemon=True)
+            self._thread.start()
+        return self._thread
+
+    def stop(self):
+        self._stop.set()
+
+    def status(self):
+        predictor = self.get_predictor()
+        state = predictor.state
+        return {
+            'running': self._thread is not None and self._thread.is_alive(),
+            'interval': self.interval,
+            'artifact_version': state.models.get('artifact_version') if state is not None else None,
+            'version': state.version if state is not None else None,
+            'source': state.source if state is not None else None,
+            'loaded_at': state.loaded_at if state is not None else None,
+            'swaps': self.swaps,
+            'last_error': self.last_error,
+            'history': list(self.history)
+        }
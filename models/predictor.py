@@ -1,101 +1,340 @@
-import pickle
+import logging
+import time
 import numpy as np
 import pandas as pd
 from config import Config
-import os
+from models.artifacts import load_model_bundle, model_version
+from models.data_store import get_data_store
+from models.metrics import get_metrics
+from models.tree_engine import CompiledEnsemble, compile_model
+
+logger = logging.getLogger(__name__)
+
+class ModelState:
+    """One loaded model version: the bundle plus everything derived from it
+
+    A state is fully built before the predictor publishes it and is never
+    modified afterwards. A prediction takes one reference to the current
+    state and uses only that, so it finishes on a consistent set of models,
+    label lookups, scalers and engines even if a newer version is swapped
+    in while it runs.
+    """
+
+    def __init__(self, models, source=None, version=None, config=None):
+        self.config = config or Config()
+        self.models = models
+        self.source = source
+        self.version = version
+        self.loaded_at = time.time()
+        self.engines = self.build_engines()
+        self.build_fast_path()
+
+    def build_engines(self):
+        """Compiled tree engines per target, checked against the sklearn models
+
+        Engines saved with the artifacts are reused; otherwise (e.g. legacy
+        pickles) they are compiled here. An engine whose output does not
+        match model.predict on a probe batch is dropped.
+        """
+        engines = {}
+        if not self.config.COMPILED_TREES:
+            return engines
+
+        for target in ['yield', 'production']:
+            model = self.models[f'{target}_model']
+            stored = self.models.get(f'{target}_engine')
+            engine = CompiledEnsemble.from_dict(stored) if stored else compile_model(model)
+            if engine is None:
+                continue
+            probe = np.random.RandomState(0).randn(32, engine.n_features)
+            if engine.matches(model, probe):
+                engines[target] = engine
+            else:
+                logger.warning(f"⚠️ Compiled {target} model disagrees with sklearn; using model.predict")
+        return engines
+
+    def build_fast_path(self):
+        """Precompute label lookups and scaler parameters for the hot path
+
+        LabelEncoder classes are sorted, so a class's position is its code.
+        Scaling uses the saved StandardScaler's mean_ and scale_ directly,
+        which is the same arithmetic as transform without its validation.
+        """
+        self.crop_codes = {crop: code for code, crop in enumerate(self.models['crop_encoder'].classes_.tolist())}
+        self.season_codes = {season: code for code, season in enumerate(self.models['season_encoder'].classes_.tolist())}
+
+        self.scaling = {}
+        for target in ['yield', 'production']:
+            scaler = self.models[f'{target}_scaler']
+            mean = 0.0 if scaler.mean_ is None else np.asarray(scaler.mean_, dtype=np.float64)
+            scale = 1.0 if scaler.scale_ is None else np.asarray(scaler.scale_, dtype=np.float64)
+            self.scaling[target] = (mean, scale)
+
+    def scale_features(self, target, features):
+        """Standardize features like the saved scaler's transform"""
+        if target not in self.scaling:
+            return self.models[f'{target}_scaler'].transform(features)
+        mean, scale = self.scaling[target]
+        return (np.asarray(features, dtype=np.float64) - mean) / scale
+
+    def predict_base(self, target, features_scaled):
+        """Raw model output for scaled features, via the compiled engine for small inputs"""
+        engine = self.engines.get(target)
+        if engine is not None and len(features_scaled) <= self.config.COMPILED_MAX_ROWS:
+            return engine.predict(features_scaled)
+        return self.models[f'{target}_model'].predict(features_scaled)
+
+    def smoke_test(self, rows=16):
+        """Predict a small batch of known inputs; returns an error message or None
+
+        Covers both targets through the compiled engines and the sklearn
+        models, so a version that loads but cannot predict is caught before
+        it is published.
+        """
+        try:
+            feature_names = self.models.get('feature_names')
+            if feature_names is not None and len(feature_names) != 4:
+                return f"unexpected features {feature_names}"
+            if not self.crop_codes or not self.season_codes:
+                return "no known crops or seasons"
+
+            rng = np.random.RandomState(0)
+            baseline_year = self.models.get('baseline_year', 2015)
+            features = np.column_stack([
+                rng.randint(len(self.crop_codes), size=rows),
+                rng.randint(len(self.season_codes), size=rows),
+                rng.uniform(1, 1000, size=rows),
+                rng.randint(2010, 2035, size=rows) - baseline_year
+            ]).astype(np.float64)
+
+            for target in ['yield', 'production']:
+                scaled = self.scale_features(target, features)
+                outputs = [self.models[f'{target}_model'].predict(scaled)]
+                if target in self.engines:
+                    outputs.append(self.engines[target].predict(scaled))
+                for output in outputs:
+                    output = np.asarray(output)
+                    if output.shape != (rows,) or not np.isfinite(output).all():
+                        return f"{target} model returned invalid predictions"
+        except Exception as e:
+            return f"smoke batch failed: {e}"
+        return None
+
+
+class TrendStats:
+    """Per-(crop, season) trend statistics, published as one immutable snapshot
+
+    index maps (crop, season) to (yield_slope, yield_mean, production_slope,
+    production_mean, latest_year); table holds the same rows as a DataFrame
+    for vectorized lookups; version is the data store version the stats
+    were computed from. A rebuild creates a new snapshot and replaces the
+    predictor's reference in one assignment, so readers never see a
+    half-built or cleared index.
+    """
+
+    def __init__(self, index=None, table=None, version=None):
+        self.index = index or {}
+        self.table = table
+        self.version = version
+
 
 class CropPredictor:
-    def __init__(self):
+    def __init__(self, data_store=None, metrics=None):
         self.config = Config()
-        self.models = None
+        self.data_store = data_store or get_data_store()
+        self.metrics = metrics or get_metrics()
+        self.state = None
         self.historical_data = None
+        self.trends = TrendStats()
         self.load_models()
         self.load_historical_data()
-        
-    def load_models(self):
-        """Load saved models and preprocessors"""
+
+    @property
+    def models(self):
+        """The model bundle being served (None if no models are loaded)"""
+        state = self.state
+        return state.models if state is not None else None
+
+    @property
+    def trend_index(self):
+        return self.trends.index
+
+    @property
+    def trend_table(self):
+        return self.trends.table
+
+    @property
+    def data_version(self):
+        """Version of the processed data the trend adjustments come from"""
+        return self.trends.version
+
+    @property
+    def model_version(self):
+        """Version stamp of the models being served (None if no models are loaded)"""
+        state = self.state
+        return state.version if state is not None else None
+
+    def load_state(self):
+        """Load the saved models into a new ModelState without publishing it
+
+        Returns None if there are no saved models or they cannot be loaded.
+        """
         try:
-            if os.path.exists(self.config.MODEL_FILE):
-                with open(self.config.MODEL_FILE, 'rb') as f:
-                    self.models = pickle.load(f)
-                print("✅ Models loaded successfully!")
-            else:
-                print("⚠️ No saved models found. Models will be trained automatically.")
-                self.models = None
+            version = model_version(self.config)
+            models, source = load_model_bundle(self.config, mmap_mode=self.config.MODEL_MMAP_MODE)
+            state = ModelState(models, source=source, version=version, config=self.config)
+            logger.info(f"✅ Models loaded successfully from {source}")
+            return state
+        except FileNotFoundError:
+            logger.warning("⚠️ No saved models found. Models will be trained automatically.")
         except Exception as e:
-            print(f"❌ Error loading models: {e}")
-            self.models = None
+            logger.error(f"❌ Error loading models: {e}")
+        return None
+
+    def load_models(self):
+        """Load saved models and preprocessors"""
+        self.state = self.load_state()
+
+    def swap_state(self, state):
+        """Publish a new model state; predictions already running keep the old one"""
+        previous, self.state = self.state, state
+        return previous
     
     def load_historical_data(self):
-        """Load historical data for trend analysis"""
+        """Load historical data for trend analysis from the shared data store"""
         try:
-            data_path = os.path.join(self.config.PROCESSED_DATA_DIR, self.config.MERGED_FILE)
-            if os.path.exists(data_path):
-                self.historical_data = pd.read_csv(data_path)
-                print("✅ Historical data loaded successfully!")
+            frame = self.data_store.frame
+            version = self.data_store.version
+            if frame is not None:
+                logger.info("✅ Historical data loaded successfully!")
             else:
-                print("⚠️ No historical data found.")
-                self.historical_data = None
+                logger.warning("⚠️ No historical data found.")
         except Exception as e:
-            print(f"❌ Error loading historical data: {e}")
-            self.historical_data = None
-    
+            logger.error(f"❌ Error loading historical data: {e}")
+            frame = version = None
+        # Build the trends before publishing either, so readers see old or new, never a mix
+        trends = self.build_trend_index(frame)
+        trends.version = version
+        self.historical_data = frame
+        self.trends = trends
+
+    def reload_historical_data(self):
+        """Reload historical data from disk and rebuild the trend index"""
+        self.data_store.reload()
+        self.load_historical_data()
+
+    def build_trend_index(self, frame):
+        """Precompute per-(crop, season) trend statistics from historical data
+
+        Returns a TrendStats with the yield/production slope and mean and the
+        latest year for every crop/season pair with at least three years of
+        data, so that calculate_year_trend only has to do a dictionary lookup.
+        The predictor's current snapshot is not touched.
+        """
+        if frame is None:
+            return TrendStats()
+
+        try:
+            data = frame[['Crop', 'Season', 'Year', 'Yield', 'Production']].copy()
+            data['Yield'] = data['Yield'].fillna(0)
+            data['Production'] = data['Production'].fillna(0)
+            grouped = data.groupby(['Crop', 'Season'], sort=False, observed=True)
+
+            # Least-squares slope per group (same as np.polyfit degree 1)
+            centered = data[['Year', 'Yield', 'Production']] - grouped[['Year', 'Yield', 'Production']].transform('mean')
+            data['xx'] = centered['Year'] ** 2
+            data['xy_yield'] = centered['Year'] * centered['Yield']
+            data['xy_production'] = centered['Year'] * centered['Production']
+
+            stats = data.groupby(['Crop', 'Season'], sort=False, observed=True).agg(
+                count=('Year', 'size'),
+                latest_year=('Year', 'max'),
+                yield_mean=('Yield', 'mean'),
+                production_mean=('Production', 'mean'),
+                xx=('xx', 'sum'),
+                xy_yield=('xy_yield', 'sum'),
+                xy_production=('xy_production', 'sum')
+            )
+            stats = stats[stats['count'] >= 3]
+
+            with np.errstate(divide='ignore', invalid='ignore'):
+                yield_slope = np.where(stats['xx'] > 0, stats['xy_yield'] / stats['xx'], 0.0)
+                production_slope = np.where(stats['xx'] > 0, stats['xy_production'] / stats['xx'], 0.0)
+
+            table = pd.DataFrame({
+                'yield_slope': yield_slope,
+                'yield_mean': stats['yield_mean'].to_numpy(dtype=float),
+                'production_slope': production_slope,
+                'production_mean': stats['production_mean'].to_numpy(dtype=float),
+                'latest_year': stats['latest_year'].to_numpy(dtype=float)
+            }, index=stats.index)
+            index = {key: tuple(values) for key, values in zip(table.index, table.to_numpy())}
+            return TrendStats(index, table)
+        except Exception as e:
+            logger.error(f"Error building trend index: {e}")
+            return TrendStats()
+
     def calculate_year_trend(self, crop, season, target_year):
         """Calculate year-based trend adjustment"""
-        if self.historical_data is None:
-            return 1.0  # No adjustment if no historical data
-        
+        entry = self.trends.index.get((crop, season))
+        if entry is None:
+            return 1.0  # No historical data or not enough data for trend
+
         try:
-            # Filter data for the specific crop and season
-            crop_season_data = self.historical_data[
-                (self.historical_data['Crop'] == crop) & 
-                (self.historical_data['Season'] == season)
-            ].copy()
-            
-            if len(crop_season_data) < 2:
-                return 1.0  # Not enough data for trend
-            
-            # Calculate year-over-year growth rates
-            crop_season_data = crop_season_data.sort_values('Year')
-            
-            # Calculate average yield and production trends
-            years = crop_season_data['Year'].values
-            yields = crop_season_data['Yield'].fillna(0).values
-            productions = crop_season_data['Production'].fillna(0).values
-            
-            if len(years) < 3:
-                return 1.0
-            
-            # Calculate linear trend (simple slope)
-            yield_trend = np.polyfit(years, yields, 1)[0] if len(yields) > 1 else 0
-            production_trend = np.polyfit(years, productions, 1)[0] if len(productions) > 1 else 0
-            
-            # Get the latest year in historical data
-            latest_year = years.max()
-            
+            yield_trend, yield_mean, production_trend, production_mean, latest_year = entry
+
             # Project trend to target year
             years_ahead = target_year - latest_year
-            
+
             # Calculate growth factor (more conservative for future projections)
             if years_ahead > 0:
                 # Future projection - be conservative
-                yield_growth = 1 + (yield_trend * years_ahead * 0.5) / np.mean(yields) if np.mean(yields) > 0 else 1.0
-                production_growth = 1 + (production_trend * years_ahead * 0.5) / np.mean(productions) if np.mean(productions) > 0 else 1.0
+                yield_growth = 1 + (yield_trend * years_ahead * 0.5) / yield_mean if yield_mean > 0 else 1.0
+                production_growth = 1 + (production_trend * years_ahead * 0.5) / production_mean if production_mean > 0 else 1.0
             else:
                 # Historical interpolation - more accurate
-                yield_growth = 1 + (yield_trend * years_ahead) / np.mean(yields) if np.mean(yields) > 0 else 1.0
-                production_growth = 1 + (production_trend * years_ahead) / np.mean(productions) if np.mean(productions) > 0 else 1.0
-            
+                yield_growth = 1 + (yield_trend * years_ahead) / yield_mean if yield_mean > 0 else 1.0
+                production_growth = 1 + (production_trend * years_ahead) / production_mean if production_mean > 0 else 1.0
+
             # Average the two growth factors and constrain to reasonable bounds
             growth_factor = (yield_growth + production_growth) / 2
             growth_factor = max(0.5, min(2.0, growth_factor))  # Between 50% and 200%
-            
+
             return growth_factor
-            
+
         except Exception as e:
-            print(f"Error calculating year trend: {e}")
+            logger.error(f"Error calculating year trend: {e}")
             return 1.0
-    
+
+    def calculate_year_trends(self, crops, seasons, target_years):
+        """Vectorized calculate_year_trend for equal-length arrays of inputs"""
+        target_years = np.asarray(target_years, dtype=float)
+        factors = np.ones(len(target_years))
+        # One snapshot for the whole batch, even if a rebuild publishes a new one
+        trend_table = self.trends.table
+        if trend_table is None or trend_table.empty:
+            return factors
+
+        keys = pd.MultiIndex.from_arrays([np.asarray(crops, dtype=object), np.asarray(seasons, dtype=object)])
+        positions = trend_table.index.get_indexer(keys)
+        found = positions >= 0
+        if not found.any():
+            return factors
+
+        table = trend_table.to_numpy()[positions[found]]
+        yield_trend, yield_mean, production_trend, production_mean, latest_year = table.T
+
+        # Future projections are damped by half, as in calculate_year_trend
+        years_ahead = target_years[found] - latest_year
+        damping = np.where(years_ahead > 0, 0.5, 1.0)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            yield_growth = np.where(yield_mean > 0, 1 + (yield_trend * years_ahead * damping) / yield_mean, 1.0)
+            production_growth = np.where(production_mean > 0, 1 + (production_trend * years_ahead * damping) / production_mean, 1.0)
+
+        factors[found] = np.clip((yield_growth + production_growth) / 2, 0.5, 2.0)
+        return factors
+
     def apply_climate_factor(self, year, base_prediction):
         """Apply climate change and technological advancement factors"""
         base_year = 2020
@@ -110,47 +349,70 @@ class CropPredictor:
         # Net effect (tech generally outweighs climate in near term)
         combined_factor = climate_factor * tech_factor
         
-        # Constrain factor to reasonable bounds
-        combined_factor = max(0.8, min(1.3, combined_factor))
+        # Constrain factor to reasonable bounds (works for scalars and arrays)
+        combined_factor = np.clip(combined_factor, 0.8, 1.3)
         
         return base_prediction * combined_factor
     
     def predict(self, crop, season, area, year):
         """Make predictions for given inputs with year-based adjustments"""
-        if not self.models:
+        result = self._predict(crop, season, area, year)
+        outcome = 'error' if 'error' in result else 'ok'
+        self.metrics.inc('predictor_requests_total', method='predict', outcome=outcome)
+        return result
+    
+    def _predict(self, crop, season, area, year):
+        """Single prediction, recording per-stage timings"""
+        # One reference for the whole prediction, even if a new version is swapped in
+        state = self.state
+        if state is None:
             return {'error': 'Models not loaded. Please train models first.'}
         
         try:
+            start = time.perf_counter()
+            
             # Encode categorical variables
-            if crop not in self.models['crop_encoder'].classes_:
+            crop_encoded = state.crop_codes.get(crop)
+            if crop_encoded is None:
                 return {'error': f'Unknown crop: {crop}'}
-            if season not in self.models['season_encoder'].classes_:
+            season_encoded = state.season_codes.get(season)
+            if season_encoded is None:
                 return {'error': f'Unknown season: {season}'}
-                
-            crop_encoded = self.models['crop_encoder'].transform([crop])[0]
-            season_encoded = self.models['season_encoder'].transform([season])[0]
+            
+            if pd.isna(area) or pd.isna(year):
+                return {'error': 'Prediction failed: area and year must be numeric'}
             
             # Use the same baseline year as training (2015)
-            baseline_year = self.models.get('baseline_year', 2015)
+            baseline_year = state.models.get('baseline_year', 2015)
             year_normalized = year - baseline_year
             
             # Create feature vector
             features = np.array([[crop_encoded, season_encoded, area, year_normalized]])
+            encoded = time.perf_counter()
             
             # Scale features
-            features_yield_scaled = self.models['yield_scaler'].transform(features)
-            features_production_scaled = self.models['production_scaler'].transform(features)
+            features_yield_scaled = state.scale_features('yield', features)
+            features_production_scaled = state.scale_features('production', features)
+            scaled = time.perf_counter()
             
             # Make base predictions
-            base_yield = self.models['yield_model'].predict(features_yield_scaled)[0]
-            base_production = self.models['production_model'].predict(features_production_scaled)[0]
+            base_yield = state.predict_base('yield', features_yield_scaled)[0]
+            base_production = state.predict_base('production', features_production_scaled)[0]
+            modeled = time.perf_counter()
             
             # Apply year-based trend adjustments
             trend_factor = self.calculate_year_trend(crop, season, year)
+            trended = time.perf_counter()
             
             # Apply climate and technology factors
             adjusted_yield = self.apply_climate_factor(year, base_yield * trend_factor)
             adjusted_production = self.apply_climate_factor(year, base_production * trend_factor)
+            adjusted = time.perf_counter()
+            
+            self.metrics.observe_stages('predictor_stage_seconds', [
+                ('encode', encoded - start), ('scale', scaled - encoded), ('model', modeled - scaled),
+                ('trend', trended - modeled), ('climate', adjusted - trended), ('total', adjusted - start)
+            ], method='predict')
             
             # Ensure positive predictions
             predicted_yield = max(0, adjusted_yield)
@@ -178,9 +440,120 @@ class CropPredictor:
         except Exception as e:
             return {'error': f'Prediction failed: {str(e)}'}
     
+    def predict_batch(self, data):
+        """Make predictions for many inputs at once.
+
+        ``data`` is a DataFrame or a mapping of equal-length columns named
+        ``crop``, ``season``, ``area`` and ``year``. Encoding, scaling and the
+        model calls run once for the whole batch. Returns a DataFrame with one
+        row per input and the same fields as ``predict``; rows that cannot be
+        predicted carry a message in the ``error`` column instead of raising.
+        """
+        start = time.perf_counter()
+        batch = pd.DataFrame({col: np.asarray(data[col]) for col in ['crop', 'season', 'area', 'year']})
+        n_rows = len(batch)
+        self.metrics.inc('predictor_rows_total', n_rows, method='predict_batch')
+
+        result = batch.copy()
+        for col in ['predicted_yield', 'predicted_production', 'productivity',
+                    'confidence', 'trend_factor', 'years_projected']:
+            result[col] = np.nan
+        result['error'] = None
+
+        # One reference for the whole batch, even if a new version is swapped in
+        state = self.state
+        if state is None:
+            result['error'] = 'Models not loaded. Please train models first.'
+            self.metrics.inc('predictor_requests_total', method='predict_batch', outcome='error')
+            return result
+
+        errors = np.full(n_rows, None, dtype=object)
+
+        # Per-row validation, reported in the same wording as predict()
+        crops = batch['crop'].to_numpy(dtype=object)
+        seasons = batch['season'].to_numpy(dtype=object)
+        areas = pd.to_numeric(batch['area'], errors='coerce').to_numpy(dtype=float)
+        years = pd.to_numeric(batch['year'], errors='coerce').to_numpy(dtype=float)
+
+        known_crop = np.array([state.crop_codes.get(c, -1) for c in crops], dtype=np.intp)
+        known_season = np.array([state.season_codes.get(s, -1) for s in seasons], dtype=np.intp)
+        bad_crop = known_crop < 0
+        bad_season = ~bad_crop & (known_season < 0)
+        errors[bad_crop] = [f'Unknown crop: {c}' for c in crops[bad_crop]]
+        errors[bad_season] = [f'Unknown season: {s}' for s in seasons[bad_season]]
+        pending = ~(bad_crop | bad_season)
+        bad_numbers = pending & (np.isnan(areas) | np.isnan(years))
+        errors[bad_numbers] = 'Prediction failed: area and year must be numeric'
+        valid = pending & ~bad_numbers
+
+        if valid.any():
+            try:
+                idx = np.flatnonzero(valid)
+                v_years = years[idx]
+                v_areas = areas[idx]
+
+                # The lookup codes are the LabelEncoder encodings
+                baseline_year = state.models.get('baseline_year', 2015)
+                features = np.column_stack([
+                    known_crop[idx], known_season[idx], v_areas, v_years - baseline_year
+                ])
+                encoded = time.perf_counter()
+
+                features_yield_scaled = state.scale_features('yield', features)
+                features_production_scaled = state.scale_features('production', features)
+                scaled = time.perf_counter()
+
+                base_yield = state.predict_base('yield', features_yield_scaled)
+                base_production = state.predict_base('production', features_production_scaled)
+                modeled = time.perf_counter()
+
+                trend_factor = self.calculate_year_trends(crops[idx], seasons[idx], v_years)
+                trended = time.perf_counter()
+
+                adjusted_yield = self.apply_climate_factor(v_years, base_yield * trend_factor)
+                adjusted_production = self.apply_climate_factor(v_years, base_production * trend_factor)
+                adjusted = time.perf_counter()
+
+                self.metrics.observe_stages('predictor_stage_seconds', [
+                    ('encode', encoded - start), ('scale', scaled - encoded), ('model', modeled - scaled),
+                    ('trend', trended - modeled), ('climate', adjusted - trended)
+                ], method='predict_batch')
+
+                predicted_yield = np.maximum(0, adjusted_yield)
+                predicted_production = np.maximum(0, adjusted_production)
+
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    productivity = np.where(v_areas > 0, np.round(predicted_production / v_areas, 2), 0)
+
+                # Same formula as predict(), fractional years included; rounded with
+                # round() once per distinct value so the results match it exactly
+                current_year = 2025
+                years_ahead = np.abs(v_years - current_year)
+                confidence = 0.85 * np.maximum(0.6, 1 - (years_ahead * 0.05))
+                distinct, positions = np.unique(confidence, return_inverse=True)
+                confidence = np.array([round(value, 3) for value in distinct.tolist()])[positions]
+
+                result.loc[idx, 'predicted_yield'] = np.round(predicted_yield, 2)
+                result.loc[idx, 'predicted_production'] = np.round(predicted_production, 2)
+                result.loc[idx, 'productivity'] = productivity
+                result.loc[idx, 'confidence'] = confidence
+                result.loc[idx, 'trend_factor'] = np.round(trend_factor, 3)
+                result.loc[idx, 'years_projected'] = years_ahead
+            except Exception as e:
+                errors[valid] = f'Prediction failed: {str(e)}'
+
+        result['error'] = errors
+        failed = int(pd.notna(errors).sum())
+        outcome = 'ok' if failed == 0 else ('error' if failed == n_rows else 'partial')
+        self.metrics.inc('predictor_requests_total', method='predict_batch', outcome=outcome)
+        self.metrics.observe('predictor_stage_seconds', time.perf_counter() - start,
+                             method='predict_batch', stage='total')
+        return result
+
     def get_available_options(self):
         """Get available crops and seasons"""
-        if not self.models:
+        models = self.models
+        if not models:
             # Return default options if models aren't loaded
             return {
                 'crops': ['Rice', 'Wheat', 'Cotton', 'Sugarcane', 'Maize'],
@@ -189,11 +562,11 @@ class CropPredictor:
         
         try:
             return {
-                'crops': list(self.models['crop_encoder'].classes_),
-                'seasons': list(self.models['season_encoder'].classes_)
+                'crops': list(models['crop_encoder'].classes_),
+                'seasons': list(models['season_encoder'].classes_)
             }
         except Exception as e:
-            print(f"Error getting options: {e}")
+            logger.error(f"Error getting options: {e}")
             return {
                 'crops': ['Rice', 'Wheat', 'Cotton', 'Sugarcane', 'Maize'],
                 'seasons': ['Kharif', 'Rabi', 'Summer', 'Annual']
@@ -201,15 +574,53 @@ class CropPredictor:
     
     def get_prediction_summary(self, crop, season, area, years):
         """Get predictions for multiple years for comparison"""
-        results = []
-        for year in years:
-            prediction = self.predict(crop, season, area, year)
-            if 'error' not in prediction:
-                results.append({
-                    'year': year,
-                    'yield': prediction['predicted_yield'],
-                    'production': prediction['predicted_production'],
-                    'productivity': prediction['productivity'],
-                    'confidence': prediction['confidence']
-                })
-        return results
\ No newline at end of file
+        years = list(years)
+        batch = self.predict_batch({
+            'crop': [crop] * len(years),
+            'season': [season] * len(years),
+            'area': [area] * len(years),
+            'year': years
+        })
+        ok = batch['error'].isna().to_numpy()
+        batch = batch[ok]
+        # The years as passed in (the batch column holds them as floats)
+        years = [year for year, keep in zip(years, ok) if keep]
+        return [
+            {
+                'year': year,
+                'yield': predicted_yield,
+                'production': predicted_production,
+                'productivity': productivity,
+                'confidence': confidence
+            }
+            for year, predicted_yield, predicted_production, productivity, confidence in zip(
+                years, batch['predicted_yield'].tolist(),
+                batch['predicted_production'].tolist(), batch['productivity'].tolist(),
+                batch['confidence'].tolist()
+            )
+        ]
+
+    def get_prediction_grid(self, years, crops=None, seasons=None, area=100):
+        """Get predictions for every years x crops x seasons combination
+
+        Crops and seasons default to all known options. Returns a tidy DataFrame
+        with one row per successful (year, crop, season) prediction.
+        """
+        options = self.get_available_options()
+        crops = options['crops'] if crops is None else list(crops)
+        seasons = options['seasons'] if seasons is None else list(seasons)
+
+        grid = pd.MultiIndex.from_product([list(years), crops, seasons], names=['year', 'crop', 'season'])
+        batch = self.predict_batch({
+            'crop': grid.get_level_values('crop'),
+            'season': grid.get_level_values('season'),
+            'area': np.full(len(grid), area),
+            'year': grid.get_level_values('year')
+        })
+        batch = batch[batch['error'].isna()]
+
+        return batch.rename(columns={
+            'predicted_yield': 'yield',
+            'predicted_production': 'production'
+        })[['year', 'crop', 'season', 'area', 'yield', 'production',
+            'productivity', 'confidence', 'trend_factor']].reset_index(drop=True)
@@ -0,0 +1,208 @@
+import importlib.util
+import os
+import numpy as np
+import pandas as pd
+from config import Config
+
+# Compact schema of the processed data. Only these columns are stored; the
+# model feature columns are derived on the fly by add_derived_columns.
+SCHEMA = {
+    'Crop': 'category',
+    'Season': 'category',
+    'Year': 'int16',
+    'Yield': 'float32',
+    'Production': 'float32',
+    'Area': 'float32'
+}
+DERIVED_COLUMNS = ['Crop_encoded', 'Season_encoded', 'Productivity', 'Year_normalized']
+BASELINE_YEAR = 2015
+
+
+def parquet_available():
+    """True if a Parquet engine (pyarrow) is installed"""
+    return importlib.util.find_spec('pyarrow') is not None
+
+
+def processed_data_paths(config=None):
+    """Return (parquet_path, csv_path) for the processed dataset"""
+    config = config or Config()
+    return (
+        os.path.join(config.PROCESSED_DATA_DIR, config.MERGED_PARQUET_FILE),
+        os.path.join(config.PROCESSED_DATA_DIR, config.MERGED_FILE)
+    )
+
+
+def file_version(path):
+    """Cheap version stamp for a file: (mtime_ns, size), or None if missing"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def find_processed_data(config=None):
+    """Return the path of the processed dataset to read, or None if there is none
+
+    The columnar Parquet file is preferred; the CSV export is used when no
+    Parquet file exists or no Parquet engine is installed.
+    """
+    parquet_path, csv_path = processed_data_paths(config)
+    if parquet_available() and os.path.exists(parquet_path):
+        return parquet_path
+    if os.path.exists(csv_path):
+        return csv_path
+    return None
+
+
+def compact_frame(df):
+    """Return the stored columns of df cast to the compact schema
+
+    Crop and Season become categoricals with sorted categories, so their
+    category codes equal the LabelEncoder encodings.
+    """
+    columns = [col for col in SCHEMA if col in df.columns]
+    compact = df[columns].copy()
+    for col in columns:
+        if SCHEMA[col] == 'category':
+            values = compact[col].astype('category').cat.remove_unused_categories()
+            compact[col] = values.cat.reorder_categories(sorted(values.cat.categories))
+        elif col == 'Year' and compact[col].isnull().any():
+            compact[col] = compact[col].astype('Int16')
+        else:
+            compact[col] = compact[col].astype(SCHEMA[col])
+    return compact.reset_index(drop=True)
+
+
+def add_derived_columns(df, baseline_year=BASELINE_YEAR):
+    """Add the model feature columns that are not stored on disk"""
+    df = df.copy()
+    df['Crop_encoded'] = df['Crop'].cat.codes.astype('int16')
+    df['Season_encoded'] = df['Season'].cat.codes.astype('int16')
+    df['Productivity'] = np.where(
+        df['Area'] > 0,
+        df['Production'] / df['Area'],
+        0
+    ).astype('float32')
+    df['Year_normalized'] = (df['Year'] - baseline_year).astype('int16')
+    return df
+
+
+def read_processed_data(path=None, config=None):
+    """Read the processed dataset (Parquet or CSV) in the compact schema"""
+    path = path or find_processed_data(config)
+    if path is None:
+        return None
+
+    if path.endswith('.parquet'):
+        df = pd.read_parquet(path)
+    else:
+        # Older CSVs also carry the derived columns; skip parsing them
+        df = pd.read_csv(
+            path,
+            usecols=lambda col: col in SCHEMA,
+            dtype={col: dtype for col, dtype in SCHEMA.items() if col != 'Year'}
+        )
+    return compact_frame(df)
+
+
+def write_processed_data(df, config=None, export_csv=None):
+    """Write the processed dataset and return the path of the primary file
+
+    Parquet is the default format. A CSV copy is written as well when
+    export_csv is set (defaults to Config.EXPORT_CSV), and CSV becomes the
+    only format if no Parquet engine is installed.
+    """
+    config = config or Config()
+    if export_csv is None:
+        export_csv = config.EXPORT_CSV
+
+    parquet_path, csv_path = processed_data_paths(config)
+    os.makedirs(config.PROCESSED_DATA_DIR, exist_ok=True)
+
+    # Each file is written to a .tmp sibling and renamed over the live one, so
+    # readers (and checksums taken meanwhile) never see a partial file
+    if config.PROCESSED_FORMAT == 'parquet' and parquet_available():
+        compact_frame(df).to_parquet(parquet_path + '.tmp', index=False)
+        os.replace(parquet_path + '.tmp', parquet_path)
+        primary_path = parquet_path
+    else:
+        export_csv = True
+        primary_path = csv_path
+
+    if export_csv:
+        compact_frame(df).to_csv(csv_path + '.tmp', index=False)
+        os.replace(csv_path + '.tmp', csv_path)
+
+    return primary_path
+
+
+class ProcessedDataWriter:
+    """Write the processed dataset incrementally, one frame at a time
+
+    Used by streaming ingestion, where the full dataset never exists in
+    memory. Frames are appended to temporary files (Parquet row groups, or
+    CSV when no Parquet engine is installed) that replace the processed
+    files only when the writer is closed without error, so readers never
+    see a partial dataset. Crop and Season are stored as strings; they
+    become sorted categoricals when the data is read back.
+    """
+
+    def __init__(self, config=None, export_csv=None):
+        self.config = config or Config()
+        self.export_csv = self.config.EXPORT_CSV if export_csv is None else export_csv
+        self.parquet_path, self.csv_path = processed_data_paths(self.config)
+        self.use_parquet = self.config.PROCESSED_FORMAT == 'parquet' and parquet_available()
+        if not self.use_parquet:
+            self.export_csv = True
+        self.rows = 0
+        self._parquet = None
+        self._csv = None
+
+    @property
+    def path(self):
+        """Path of the primary processed file"""
+        return self.parquet_path if self.use_parquet else self.csv_path
+
+    def __enter__(self):
+        os.makedirs(self.config.PROCESSED_DATA_DIR, exist_ok=True)
+        if self.use_parquet:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            schema = pa.schema([(col, pa.string() if dtype == 'category' else pa.from_numpy_dtype(np.dtype(dtype)))
+                                for col, dtype in SCHEMA.items()])
+            self._parquet = pq.ParquetWriter(self.parquet_path + '.tmp', schema)
+        if self.export_csv:
+            self._csv = open(self.csv_path + '.tmp', 'w', newline='')
+        return self
+
+    def append(self, df):
+        """Append rows in the stored columns (Year must not be missing)"""
+        if df.empty:
+            return
+        df = df[list(SCHEMA)].astype({
+            col: object if dtype == 'category' else dtype for col, dtype in SCHEMA.items()
+        })
+        if self._parquet is not None:
+            import pyarrow as pa
+            self._parquet.write_table(pa.Table.from_pandas(df, schema=self._parquet.schema, preserve_index=False))
+        if self._csv is not None:
+            df.to_csv(self._csv, index=False, header=self.rows == 0)
+        self.rows += len(df)
+
+    def __exit__(self, exc_type, exc, tb):
+        if self._parquet is not None:
+            self._parquet.close()
+        if self._csv is not None:
+            if self.rows == 0:
+                # Keep the header so an empty dataset is still readable
+                pd.DataFrame(columns=list(SCHEMA)).to_csv(self._csv, index=False)
+            self._csv.close()
+        for path, handle in ((self.parquet_path, self._parquet), (self.csv_path, self._csv)):
+            if handle is None:
+                continue
+            if exc_type is None:
+                os.replace(path + '.tmp', path)
+            elif os.path.exists(path + '.tmp'):
+                os.remove(path + '.tmp')
+        return False
@@ -0,0 +1,128 @@
+import numpy as np
+
+# Losses whose prediction is the raw boosting score
+IDENTITY_LOSSES = ('squared_error', 'absolute_error', 'huber', 'quantile')
+
+
+class CompiledEnsemble:
+    """Array-backed copy of a fitted tree ensemble for fast inference
+
+    All trees are concatenated into flat node tables (feature, threshold,
+    left, right, value). Leaves point to themselves, so every row can be
+    walked down every tree at once with a fixed number of vectorized steps
+    (the deepest tree's depth). The prediction is
+    offset + scale * sum of the tree outputs, which covers a Random Forest
+    (scale = 1 / n_trees) and Gradient Boosting (offset = init prediction,
+    scale = learning_rate).
+    """
+
+    def __init__(self, feature, threshold, left, right, value, roots, max_depth,
+                 n_features, scale=1.0, offset=0.0):
+        # Plain ndarray views: indexing np.memmap objects is slower
+        self.feature = np.asarray(feature)
+        self.threshold = np.asarray(threshold)
+        self.left = np.asarray(left)
+        self.right = np.asarray(right)
+        self.value = np.asarray(value)
+        self.roots = np.asarray(roots)
+        self.max_depth = int(max_depth)
+        self.n_features = int(n_features)
+        self.scale = float(scale)
+        self.offset = float(offset)
+
+    @classmethod
+    def from_model(cls, model):
+        """Compile a fitted RandomForest/GradientBoosting/DecisionTree regressor
+
+        Raises TypeError for unsupported models (e.g. LinearRegression).
+        """
+        from sklearn.ensemble import GradientBoostingRegressor, RandomForestRegressor
+        from sklearn.tree import DecisionTreeRegressor
+
+        if isinstance(model, RandomForestRegressor):
+            trees = [est.tree_ for est in model.estimators_]
+            scale, offset = 1.0 / len(trees), 0.0
+        elif isinstance(model, GradientBoostingRegressor):
+            if model.loss not in IDENTITY_LOSSES:
+                raise TypeError(f"Unsupported Gradient Boosting loss: {model.loss}")
+            trees = [est.tree_ for est in model.estimators_[:, 0]]
+            scale = model.learning_rate
+            if model.init_ == 'zero':
+                offset = 0.0
+            else:
+                offset = model.init_.predict(np.zeros((1, model.n_features_in_)))[0]
+        elif isinstance(model, DecisionTreeRegressor):
+            trees = [model.tree_]
+            scale, offset = 1.0, 0.0
+        else:
+            raise TypeError(f"Cannot compile {type(model).__name__}")
+
+        if any(tree.n_outputs != 1 for tree in trees):
+            raise TypeError("Only single-output trees can be compiled")
+
+        features, thresholds, lefts, rights, values, roots = [], [], [], [], [], []
+        start = 0
+        for tree in trees:
+            node_ids = np.arange(tree.node_count)
+            is_leaf = tree.children_left < 0
+            # Leaves loop back to themselves and test an arbitrary feature
+            features.append(np.where(is_leaf, 0, tree.feature))
+            thresholds.append(tree.threshold)
+            lefts.append(np.where(is_leaf, node_ids, tree.children_left) + start)
+            rights.append(np.where(is_leaf, node_ids, tree.children_right) + start)
+            values.append(tree.value[:, 0, 0])
+            roots.append(start)
+            start += tree.node_count
+
+        return cls(
+            feature=np.concatenate(features).astype(np.intp),
+            threshold=np.concatenate(thresholds).astype(np.float64),
+            left=np.concatenate(lefts).astype(np.intp),
+            right=np.concatenate(rights).astype(np.intp),
+            value=np.concatenate(values).astype(np.float64),
+            roots=np.asarray(roots, dtype=np.intp),
+            max_depth=max(tree.max_depth for tree in trees),
+            n_features=model.n_features_in_,
+            scale=scale,
+            offset=offset
+        )
+
+    def predict(self, X):
+        """Predict a 2-D batch (or a single 1-D row) of already scaled features"""
+        # scikit-learn compares float32 features against float64 thresholds
+        X = np.asarray(X, dtype=np.float32)
+        single = X.ndim == 1
+        X = np.atleast_2d(X)
+        if X.shape[1] != self.n_features:
+            raise ValueError(f"X has {X.shape[1]} features, expected {self.n_features}")
+
+        rows = np.arange(len(X))[:, None]
+        nodes = np.broadcast_to(self.roots, (len(X), len(self.roots)))
+        for _ in range(self.max_depth):
+            go_left = X[rows, self.feature[nodes]] <= self.threshold[nodes]
+            nodes = np.where(go_left, self.left[nodes], self.right[nodes])
+
+        predictions = self.offset + self.scale * self.value[nodes].sum(axis=1)
+        return predictions[0] if single else predictions
+
+    def matches(self, model, X, rtol=1e-6, atol=1e-6):
+        """True if predictions on X agree with model.predict within tolerance"""
+        return np.allclose(self.predict(X), model.predict(np.asarray(X)), rtol=rtol, atol=atol)
+
+    def to_dict(self):
+        """Plain arrays and scalars, for storing next to the model artifacts"""
+        return {name: getattr(self, name) for name in
+                ('feature', 'threshold', 'left', 'right', 'value', 'roots',
+                 'max_depth', 'n_features', 'scale', 'offset')}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**data)
+
+
+def compile_model(model):
+    """Compile a model if it is a supported tree ensemble, else return None"""
+    try:
+        return CompiledEnsemble.from_model(model)
+    except TypeError:
+        return None
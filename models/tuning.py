@@ -0,0 +1,193 @@
+import itertools
+import math
+import time
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from sklearn.metrics import r2_score
+from sklearn.model_selection import KFold, TimeSeriesSplit
+
+# Search spaces per algorithm; every combination is a candidate configuration
+SEARCH_SPACES = {
+    'Linear Regression': {
+        'fit_intercept': [True, False]
+    },
+    'Random Forest': {
+        'n_estimators': [50, 100, 200, 400],
+        'max_depth': [None, 5, 10, 20],
+        'min_samples_leaf': [1, 2, 4],
+        'max_features': [1.0, 0.5, 'sqrt']
+    },
+    'Gradient Boosting': {
+        'n_estimators': [100, 200, 400],
+        'learning_rate': [0.03, 0.1, 0.3],
+        'max_depth': [2, 3, 5],
+        'subsample': [0.8, 1.0]
+    }
+}
+
+
+def evaluate_candidate(name, params, X, y, splits):
+    """Cross-validate one configuration; returns (mean R², mean fit seconds)
+
+    Module-level so candidates can be evaluated in a process pool.
+    """
+    from models.model_trainer import build_model
+
+    scores = []
+    fit_times = []
+    for train_idx, val_idx in splits:
+        model = build_model(name, params=params)
+        start = time.perf_counter()
+        model.fit(X[train_idx], y[train_idx])
+        fit_times.append(time.perf_counter() - start)
+        scores.append(r2_score(y[val_idx], model.predict(X[val_idx])))
+    return float(np.mean(scores)), float(np.mean(fit_times))
+
+
+class HyperparameterSearch:
+    """Cross-validated hyperparameter search with successive-halving pruning
+
+    strategy='random' scores n_candidates sampled configurations on all the
+    data. strategy='halving' scores them on a small sample first and only
+    promotes the best 1/factor of each rung to a larger sample, so
+    unpromising configurations are pruned before they are fit on the full
+    data. cv is 'kfold' or 'time' (TimeSeriesSplit over the order argument
+    of search). The whole search for one algorithm stops launching trials
+    once time_budget seconds have passed; every trial is recorded with its
+    score and fit time.
+    """
+
+    def __init__(self, strategy='halving', n_candidates=12, cv='kfold', n_splits=5,
+                 factor=3, time_budget=None, n_jobs=1, random_state=42, search_spaces=None):
+        if strategy not in ('halving', 'random'):
+            raise ValueError(f"Unknown search strategy: {strategy}")
+        if cv not in ('kfold', 'time'):
+            raise ValueError(f"Unknown CV scheme: {cv}")
+        self.strategy = strategy
+        self.n_candidates = n_candidates
+        self.cv = cv
+        self.n_splits = n_splits
+        self.factor = factor
+        self.time_budget = time_budget
+        self.n_jobs = n_jobs
+        self.random_state = random_state
+        self.search_spaces = search_spaces or SEARCH_SPACES
+
+    @classmethod
+    def from_config(cls, config):
+        """Build a search from the SEARCH_* settings in Config"""
+        from models.model_trainer import resolve_worker_budget
+        return cls(
+            strategy=config.SEARCH_STRATEGY,
+            n_candidates=config.SEARCH_CANDIDATES,
+            cv=config.SEARCH_CV,
+            n_splits=config.SEARCH_CV_SPLITS,
+            time_budget=config.SEARCH_TIME_BUDGET,
+            n_jobs=resolve_worker_budget(config.TRAINING_N_JOBS)
+        )
+
+    def sample_candidates(self, name):
+        """Sample up to n_candidates distinct configurations for an algorithm"""
+        space = self.search_spaces.get(name, {})
+        keys = list(space)
+        grid = [dict(zip(keys, values)) for values in itertools.product(*(space[k] for k in keys))]
+        if len(grid) <= self.n_candidates:
+            return grid
+        rng = np.random.RandomState(self.random_state)
+        picks = rng.choice(len(grid), size=self.n_candidates, replace=False)
+        return [grid[i] for i in sorted(picks)]
+
+    def _splits(self, n_samples, order, rows):
+        """CV folds over the given rows, as positions into X"""
+        if self.cv == 'time':
+            rows = rows[np.argsort(order[rows], kind='stable')]
+            splitter = TimeSeriesSplit(n_splits=min(self.n_splits, n_samples - 1))
+        else:
+            splitter = KFold(n_splits=min(self.n_splits, n_samples), shuffle=True,
+                             random_state=self.random_state)
+        return [(rows[train], rows[val]) for train, val in splitter.split(rows)]
+
+    def _rung_sizes(self, n_candidates, n_samples):
+        """Sample sizes per rung: grow by factor, ending with all the data"""
+        if self.strategy == 'random' or n_candidates <= 1:
+            return [n_samples]
+        n_rungs = max(1, math.ceil(math.log(n_candidates, self.factor)) + 1)
+        # Small rungs still need a few validation rows per fold to be meaningful
+        min_size = max(self.n_splits * 5, n_samples // self.factor ** (n_rungs - 1))
+        sizes = [min(n_samples, min_size * self.factor ** i) for i in range(n_rungs)]
+        sizes[-1] = n_samples
+        return sorted(set(sizes))
+
+    def search(self, name, X, y, order=None):
+        """Search configurations for one algorithm on (X, y)
+
+        Returns a dict with the best params, their CV score and the list of
+        trials (params, rung, n_samples, score, fit_time, status).
+        """
+        X = np.asarray(X)
+        y = np.asarray(y)
+        n_samples = len(y)
+        order = np.arange(n_samples) if order is None else np.asarray(order)
+        deadline = None if self.time_budget is None else time.monotonic() + self.time_budget
+        rng = np.random.RandomState(self.random_state)
+        sample_order = rng.permutation(n_samples)
+
+        candidates = self.sample_candidates(name)
+        trials = []
+        scored = []
+
+        sizes = self._rung_sizes(len(candidates), n_samples)
+        for rung, size in enumerate(sizes):
+            splits = self._splits(size, order, sample_order[:size])
+            rung_scored = self._evaluate_rung(name, candidates, X, y, splits, rung, size, deadline, trials)
+            if not rung_scored:
+                break
+
+            rung_scored.sort(key=lambda item: item[1]['score'], reverse=True)
+            if rung == len(sizes) - 1 or (deadline is not None and time.monotonic() > deadline):
+                # No next rung: every candidate stays completed and the best wins
+                scored = rung_scored
+                break
+
+            # Promote the best 1/factor to the next rung; the rest are pruned
+            keep = max(1, math.ceil(len(rung_scored) / self.factor))
+            for _, trial in rung_scored[keep:]:
+                trial['status'] = 'pruned'
+            scored = rung_scored[:keep]
+            candidates = [params for params, _ in scored]
+
+        if not scored:
+            # Budget ran out before anything finished; fall back to defaults
+            return {'algorithm': name, 'best_params': {}, 'best_score': None, 'trials': trials}
+
+        best_params, best_trial = scored[0]
+        return {'algorithm': name, 'best_params': best_params,
+                'best_score': best_trial['score'], 'trials': trials}
+
+    def _evaluate_rung(self, name, candidates, X, y, splits, rung, size, deadline, trials):
+        """Score every candidate of a rung, sequentially or in a process pool"""
+        def record(params, result, status):
+            score, fit_time = result if result else (None, None)
+            trial = {'algorithm': name, 'params': params, 'rung': rung, 'n_samples': size,
+                     'score': score, 'fit_time': fit_time, 'status': status}
+            trials.append(trial)
+            if result:
+                scored.append((params, trial))
+
+        scored = []
+        if self.n_jobs > 1 and len(candidates) > 1:
+            with ProcessPoolExecutor(max_workers=min(self.n_jobs, len(candidates))) as executor:
+                futures = [(params, executor.submit(evaluate_candidate, name, params, X, y, splits))
+                           for params in candidates]
+                for params, future in futures:
+                    if deadline is not None and time.monotonic() > deadline and future.cancel():
+                        record(params, None, 'budget')
+                    else:
+                        record(params, future.result(), 'completed')
+        else:
+            for params in candidates:
+                if deadline is not None and time.monotonic() > deadline:
+                    record(params, None, 'budget')
+                else:
+                    record(params, evaluate_candidate(name, params, X, y, splits), 'completed')
+        return scored
@@ -2,13 +2,52 @@
 """
 Main script to run the crop prediction dashboard
 """
+import logging
 import os
 import sys
-from models.data_processor import DataProcessor
-from models.model_trainer import ModelTrainer
-from models.predictor import CropPredictor
+from models.data_store import get_data_store
+from models.artifacts import models_available
+from models.incremental import load_raw_state
+from models.lineage import (changed_parts, compute_fingerprint, is_up_to_date, load_lineage, record_lineage,
+                            update_and_record)
 from config import Config
 
+# Serving code reports through logging; show it like the setup prints
+logging.basicConfig(level=logging.INFO, format='%(message)s')
+
+def train_from_scratch(fingerprint=None):
+    """Process the raw data and train new models"""
+    # Training pulls in scikit-learn; keep it off the server's import path
+    from models.data_processor import DataProcessor
+    from models.model_trainer import ModelTrainer
+    
+    # Process data
+    processor = DataProcessor()
+    merged_df = processor.load_and_process_data()
+    
+    if merged_df is not None:
+        # Share the freshly built frame instead of re-parsing the file
+        get_data_store().load(frame=merged_df)
+        
+        # Prepare features
+        X_yield, y_yield, X_production, y_production = processor.prepare_features(merged_df)
+        
+        # Train models
+        trainer = ModelTrainer(processor)
+        yield_results, production_results = trainer.train_models(
+            X_yield, y_yield, X_production, y_production
+        )
+        
+        # Save models and record what they were built from
+        if not trainer.save_models():
+            return False
+        record_lineage(fingerprint or compute_fingerprint(), options={'search': False})
+        print("Models trained and saved successfully!")
+        return True
+    
+    print("Error: Could not process data. Please check your data files.")
+    return False
+
 def setup_project():
     """Setup the project by training models if needed"""
     config = Config()
@@ -18,38 +57,37 @@ def setup_project():
     os.makedirs(config.PROCESSED_DATA_DIR, exist_ok=True)
     
     # Check if models exist
-    if not os.path.exists(config.MODEL_FILE):
+    fingerprint = compute_fingerprint(config)
+    if not models_available(config):
         print("Models not found. Training new models...")
-        
-        # Process data
-        processor = DataProcessor()
-        merged_df = processor.load_and_process_data()
-        
-        if merged_df is not None:
-            # Prepare features
-            X_yield, y_yield, X_production, y_production = processor.prepare_features(merged_df)
-            
-            # Train models
-            trainer = ModelTrainer(processor)
-            yield_results, production_results = trainer.train_models(
-                X_yield, y_yield, X_production, y_production
-            )
-            
-            # Save models
-            trainer.save_models()
-            print("Models trained and saved successfully!")
-        else:
-            print("Error: Could not process data. Please check your data files.")
-            return False
-    else:
-        print("✅ Models found and loaded!")
+        return train_from_scratch(fingerprint)
+    
+    # Raw data, pipeline code and config unchanged since the recorded build
+    if is_up_to_date(fingerprint, config):
+        print(f"✅ Models are up to date (fingerprint {fingerprint['fingerprint'][:12]})")
+        return True
+    
+    print("✅ Models found and loaded!")
+    
+    # Builds from before lineage was recorded are only checked for raw changes
+    changed = changed_parts(fingerprint, config) if load_lineage(config) else ['inputs']
+    if not set(changed) <= {'inputs'}:
+        print(f"🔁 Pipeline {' and '.join(part for part in changed if part != 'inputs')} changed; "
+              "retraining models from scratch...")
+        return train_from_scratch(fingerprint)
+    
+    # Pick up raw files that changed since the last processing run
+    if load_raw_state(config) is not None:
+        if update_and_record(fingerprint, config) == 'full':
+            print("Retraining models from scratch...")
+            return train_from_scratch(fingerprint)
     
     return True
 
 # -----------------------------
 # ✅ Expose app + server for Gunicorn
 # -----------------------------
-from dashboard.app import app
+from dashboard.app import app, start_model_watcher
 server = app.server   # This is what Gunicorn will run
 
 def main():
@@ -64,6 +102,9 @@ def main():
     config = Config()
     print(f"🚀 Dashboard starting at http://{config.HOST}:{config.PORT}")
     
+    # Pick up newly trained models without restarting
+    start_model_watcher()
+    
     # Local run
     try:
         app.run(debug=config.DEBUG, host=config.HOST, port=config.PORT)
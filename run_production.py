@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Production launcher: prepare models and data, then serve the dashboard with gunicorn
+
+    python run_production.py [--workers N] [--threads N] [--bind HOST:PORT]
+
+Settings live in gunicorn.conf.py; send SIGHUP to the master to reload the
+models without downtime.
+"""
+import argparse
+import os
+import sys
+from config import Config
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the dashboard under gunicorn")
+    parser.add_argument("--workers", type=int, help="worker processes (default: one per core)")
+    parser.add_argument("--threads", type=int, help="threads per worker (default: Config.GUNICORN_THREADS)")
+    parser.add_argument("--bind", help="address to listen on (default: Config.GUNICORN_BIND)")
+    args = parser.parse_args()
+
+    # Setup only needs the pipeline; gunicorn's master loads the app itself
+    Config.WARMUP_ON_IMPORT = False
+    from run_dashboard import setup_project
+
+    print("🌾 Preparing models and data...")
+    if not setup_project():
+        print("❌ Setup failed. Exiting.")
+        sys.exit(1)
+
+    argv = [sys.executable, '-m', 'gunicorn', '--chdir', ROOT, '--config', os.path.join(ROOT, 'gunicorn.conf.py')]
+    if args.workers:
+        argv += ['--workers', str(args.workers)]
+    if args.threads:
+        argv += ['--threads', str(args.threads)]
+    if args.bind:
+        argv += ['--bind', args.bind]
+
+    print(f"🚀 Starting gunicorn: {' '.join(argv[1:])}")
+    sys.stdout.flush()
+    os.execv(sys.executable, argv)
+
+
+if __name__ == "__main__":
+    main()
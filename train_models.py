@@ -2,17 +2,41 @@
 """
 Script to manually train and save models
 """
+import argparse
+import json
+from config import Config
 from models.data_processor import DataProcessor
 from models.model_trainer import ModelTrainer
+from models.lineage import changed_parts, compute_fingerprint, is_up_to_date, record_lineage, update_and_record
+from models.tuning import HyperparameterSearch
 
-def train_models():
+def train_models(n_jobs=None, search=False, incremental=False, streaming=None, force=False):
     """Train and save models"""
     print("🚀 Starting Model Training...")
     print("=" * 50)
     
+    # Skip the whole pipeline when raw data, code and config match the last build
+    fingerprint = compute_fingerprint()
+    options = {'search': search}
+    if not force and is_up_to_date(fingerprint, options=options):
+        print(f"✅ Raw data, pipeline code and config unchanged (fingerprint {fingerprint['fingerprint'][:12]}); "
+              "skipping processing and training.")
+        print("Models are ready for the dashboard!")
+        return
+    changed = changed_parts(fingerprint)
+    print(f"🔍 Changed since the last build: {', '.join(changed) or 'outputs or options'}")
+    
+    # Warm-starting only accounts for new raw data, not for code or config changes
+    if incremental and set(changed) <= {'inputs'}:
+        # Only reprocess changed years and warm-start the models when possible
+        if update_and_record(fingerprint) != 'full':
+            print("Models are ready for the dashboard!")
+            return
+        print("Falling back to a full rebuild...")
+    
     # Process data
     processor = DataProcessor()
-    merged_df = processor.load_and_process_data()
+    merged_df = processor.load_and_process_data(streaming=streaming)
     
     if merged_df is not None:
         print("\n" + "="*50)
@@ -28,16 +52,27 @@ def train_models():
         
         # Train models
         trainer = ModelTrainer(processor)
+        hyperparameter_search = HyperparameterSearch.from_config(Config()) if search else None
         yield_results, production_results = trainer.train_models(
-            X_yield, y_yield, X_production, y_production
+            X_yield, y_yield, X_production, y_production, n_jobs=n_jobs,
+            search=hyperparameter_search
         )
         
+        if search:
+            # Keep every trial's score and fit time for later inspection
+            with open(Config.SEARCH_RESULTS_FILE, 'w') as f:
+                json.dump(trainer.search_results, f, indent=2, default=str)
+            print(f"📝 Search trials saved to {Config.SEARCH_RESULTS_FILE}")
+        
         print("\n" + "="*50)
         print("💾 SAVING MODELS")
         print("="*50)
         
         # Save models
-        trainer.save_models()
+        if trainer.save_models():
+            entry = record_lineage(fingerprint, options=options)
+            if entry:
+                print(f"📜 Lineage: {entry['processed']['file']} -> artifact {entry['artifact']}")
         
         print("\n" + "="*50)
         print("✅ TRAINING COMPLETE!")
@@ -48,4 +83,18 @@ def train_models():
         print("❌ Data processing failed. Cannot train models.")
 
 if __name__ == "__main__":
-    train_models()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Train and save crop prediction models")
+    parser.add_argument("--jobs", type=int, default=None,
+                        help="worker budget for training (-1 = all cores, default: Config.TRAINING_N_JOBS)")
+    parser.add_argument("--search", action="store_true",
+                        help="tune hyperparameters with cross-validated search before selection")
+    parser.add_argument("--incremental", action="store_true",
+                        help="only reprocess changed raw year columns and warm-start existing models")
+    parser.add_argument("--streaming", action="store_true", default=None,
+                        help="read the raw files in chunks and join them partition by partition "
+                             "(default: only when larger than Config.STREAMING_MIN_RAW_MB)")
+    parser.add_argument("--force", action="store_true",
+                        help="rebuild even if raw data, code and config match the last build")
+    args = parser.parse_args()
+    train_models(n_jobs=args.jobs, search=args.search, incremental=args.incremental, streaming=args.streaming,
+                 force=args.force)
\ No newline at end of file